@@ -0,0 +1,538 @@
+# aes_backends.py
+# Interchangeable block cipher implementations behind AES256WithSteps:
+#   pycryptodome - the C implementation (fast path, every mode)
+#   ttable       - pure-Python T-table AES (SubBytes+ShiftRows+MixColumns as lookups)
+#   bitslice     - NumPy bit-sliced AES, many blocks per operation
+# The reference backends implement ECB, CBC, CFB, OFB and CTR on top of their
+# block functions; authenticated modes are only offered by pycryptodome.
+
+BLOCK_SIZE = 16
+ROUNDS = 14
+REFERENCE_MODES = ['ECB', 'CBC', 'CFB', 'OFB', 'CTR']
+
+
+def _xtime(value):
+    """Multiply by x in GF(2^8) modulo the AES polynomial x^8 + x^4 + x^3 + x + 1"""
+    value <<= 1
+    return value ^ 0x11B if value & 0x100 else value
+
+
+def _gf_mul(a, b):
+    result = 0
+    while b:
+        if b & 1:
+            result ^= a
+        a = _xtime(a)
+        b >>= 1
+    return result
+
+
+def _build_sboxes():
+    # Multiplicative inverse via a log/antilog table over generator 3, then the affine map
+    exp = [0] * 255
+    log = [0] * 256
+    value = 1
+    for i in range(255):
+        exp[i] = value
+        log[value] = i
+        value ^= _xtime(value)  # value * 3
+
+    sbox = [0] * 256
+    for x in range(256):
+        inverse = exp[(255 - log[x]) % 255] if x else 0
+        result = inverse
+        for shift in range(1, 5):
+            result ^= ((inverse << shift) | (inverse >> (8 - shift))) & 0xFF
+        sbox[x] = result ^ 0x63
+
+    inv_sbox = [0] * 256
+    for x, y in enumerate(sbox):
+        inv_sbox[y] = x
+    return sbox, inv_sbox
+
+
+# Tables are built once at import time
+SBOX, INV_SBOX = _build_sboxes()
+
+# Multiples needed by MixColumns/InvMixColumns, indexed by byte value
+MUL2 = [_xtime(x) for x in range(256)]
+MUL4 = [MUL2[x] for x in MUL2]
+MUL8 = [MUL2[x] for x in MUL4]
+MUL3 = [MUL2[x] ^ x for x in range(256)]
+MUL9 = [MUL8[x] ^ x for x in range(256)]
+MUL11 = [MUL8[x] ^ MUL2[x] ^ x for x in range(256)]
+MUL13 = [MUL8[x] ^ MUL4[x] ^ x for x in range(256)]
+MUL14 = [MUL8[x] ^ MUL4[x] ^ MUL2[x] for x in range(256)]
+
+# Te0[x] = (2·S[x], S[x], S[x], 3·S[x]) packed big-endian; Te1..Te3 are byte rotations
+TE0 = [(MUL2[s] << 24) | (s << 16) | (s << 8) | MUL3[s] for s in SBOX]
+TE1 = [((t >> 8) | (t << 24)) & 0xFFFFFFFF for t in TE0]
+TE2 = [((t >> 16) | (t << 16)) & 0xFFFFFFFF for t in TE0]
+TE3 = [((t >> 24) | (t << 8)) & 0xFFFFFFFF for t in TE0]
+
+# Td0[x] = (14·Si[x], 9·Si[x], 13·Si[x], 11·Si[x]) for the equivalent inverse cipher
+TD0 = [(MUL14[s] << 24) | (MUL9[s] << 16) | (MUL13[s] << 8) | MUL11[s] for s in INV_SBOX]
+TD1 = [((t >> 8) | (t << 24)) & 0xFFFFFFFF for t in TD0]
+TD2 = [((t >> 16) | (t << 16)) & 0xFFFFFFFF for t in TD0]
+TD3 = [((t >> 24) | (t << 8)) & 0xFFFFFFFF for t in TD0]
+
+RCON = [0x01, 0x02, 0x04, 0x08, 0x10, 0x20, 0x40]
+
+
+def expand_key(key):
+    """
+    AES-256 key expansion
+
+    Args:
+        key (bytes): 32-byte key
+
+    Returns:
+        list: 60 round-key words (15 round keys of 4 words)
+    """
+    if len(key) != 32:
+        raise ValueError("Key must be 32 bytes for AES-256")
+    words = [int.from_bytes(key[i:i + 4], 'big') for i in range(0, 32, 4)]
+    for i in range(8, 4 * (ROUNDS + 1)):
+        temp = words[i - 1]
+        if i % 8 == 0:
+            temp = ((temp << 8) | (temp >> 24)) & 0xFFFFFFFF
+            temp = ((SBOX[temp >> 24] << 24) | (SBOX[(temp >> 16) & 0xFF] << 16) |
+                    (SBOX[(temp >> 8) & 0xFF] << 8) | SBOX[temp & 0xFF])
+            temp ^= RCON[i // 8 - 1] << 24
+        elif i % 8 == 4:
+            temp = ((SBOX[temp >> 24] << 24) | (SBOX[(temp >> 16) & 0xFF] << 16) |
+                    (SBOX[(temp >> 8) & 0xFF] << 8) | SBOX[temp & 0xFF])
+        words.append(words[i - 8] ^ temp)
+    return words
+
+
+def _xor_bytes(a, b):
+    length = min(len(a), len(b))
+    return (int.from_bytes(a[:length], 'big') ^ int.from_bytes(b[:length], 'big')).to_bytes(length, 'big')
+
+
+class _BlockModeCipher:
+    """
+    Stateful ECB/CBC/CFB/OFB/CTR cipher over a backend's block functions,
+    mirroring pycryptodome semantics (CFB uses 8-bit segments, CTR treats the
+    16-byte IV as a big-endian counter block).
+    """
+
+    def __init__(self, backend, key, mode, iv):
+        self.backend = backend
+        self.mode = mode
+        self.schedule = backend.prepare_key(key)
+        self._register = iv
+        self._counter = int.from_bytes(iv, 'big') if mode == 'CTR' else 0
+        self._keystream = b''
+
+    def _encrypt_blocks(self, data):
+        return self.backend.encrypt_blocks(self.schedule, data)
+
+    def _keystream_bytes(self, length):
+        """Keystream for CTR (generated in bulk, parallel) or OFB (sequential)"""
+        stream = self._keystream
+        needed = length - len(stream)
+        if needed > 0:
+            num_blocks = (needed + BLOCK_SIZE - 1) // BLOCK_SIZE
+            if self.mode == 'CTR':
+                counters = b''.join(((self._counter + i) % (1 << 128)).to_bytes(16, 'big')
+                                    for i in range(num_blocks))
+                self._counter = (self._counter + num_blocks) % (1 << 128)
+                stream += self._encrypt_blocks(counters)
+            else:
+                blocks = []
+                for _ in range(num_blocks):
+                    self._register = self._encrypt_blocks(self._register)
+                    blocks.append(self._register)
+                stream += b''.join(blocks)
+        self._keystream = stream[length:]
+        return stream[:length]
+
+    def _cfb(self, data, decrypting):
+        output = bytearray(len(data))
+        register = self._register
+        for i, byte in enumerate(data):
+            out = byte ^ self._encrypt_blocks(register)[0]
+            output[i] = out
+            register = register[1:] + bytes([byte if decrypting else out])
+        self._register = register
+        return bytes(output)
+
+    def encrypt(self, data):
+        if self.mode in ['ECB', 'CBC'] and len(data) % BLOCK_SIZE:
+            raise ValueError("Data must be aligned to block boundary in ECB/CBC mode")
+        if self.mode == 'ECB':
+            return self._encrypt_blocks(data)
+        if self.mode == 'CBC':
+            # Chaining makes CBC encryption inherently sequential
+            blocks = []
+            previous = self._register
+            for i in range(0, len(data), BLOCK_SIZE):
+                previous = self._encrypt_blocks(_xor_bytes(data[i:i + BLOCK_SIZE], previous))
+                blocks.append(previous)
+            self._register = previous
+            return b''.join(blocks)
+        if self.mode == 'CFB':
+            return self._cfb(data, decrypting=False)
+        return _xor_bytes(data, self._keystream_bytes(len(data)))
+
+    def decrypt(self, data):
+        if self.mode in ['ECB', 'CBC'] and len(data) % BLOCK_SIZE:
+            raise ValueError("Data must be aligned to block boundary in ECB/CBC mode")
+        if self.mode == 'ECB':
+            return self.backend.decrypt_blocks(self.schedule, data)
+        if self.mode == 'CBC':
+            # Every block decrypts independently, so the whole message goes in one call
+            decrypted = self.backend.decrypt_blocks(self.schedule, data)
+            previous = self._register + data[:-BLOCK_SIZE] if data else b''
+            if data:
+                self._register = data[-BLOCK_SIZE:]
+            return _xor_bytes(decrypted, previous)
+        if self.mode == 'CFB':
+            return self._cfb(data, decrypting=True)
+        return _xor_bytes(data, self._keystream_bytes(len(data)))
+
+
+class PycryptodomeBackend:
+    """pycryptodome's C implementation; supports every mode"""
+
+    name = 'pycryptodome'
+    modes = ['ECB', 'CBC', 'CFB', 'OFB', 'CTR', 'GCM', 'EAX', 'SIV']
+
+    def new_cipher(self, key, mode, iv=None):
+        from Crypto.Cipher import AES
+
+        if mode == 'ECB':
+            return AES.new(key, AES.MODE_ECB)
+        if mode in ['CBC', 'CFB', 'OFB']:
+            return AES.new(key, getattr(AES, f'MODE_{mode}'), iv)
+        if mode == 'CTR':
+            # The full 16-byte nonce is the initial counter block
+            return AES.new(key, AES.MODE_CTR, nonce=b'', initial_value=iv)
+        return AES.new(key, getattr(AES, f'MODE_{mode}'), nonce=iv)
+
+
+class TTableBackend:
+    """
+    Pure-Python AES with T-tables: each round is 16 table lookups and XORs
+    per block, with SubBytes, ShiftRows and MixColumns folded into Te0..Te3.
+    """
+
+    name = 'ttable'
+    modes = REFERENCE_MODES
+
+    def new_cipher(self, key, mode, iv=None):
+        return _BlockModeCipher(self, key, mode, iv)
+
+    def prepare_key(self, key):
+        encrypt_words = expand_key(key)
+        # Equivalent inverse cipher: reverse round order, InvMixColumns on rounds 1..13
+        decrypt_words = []
+        for round_num in range(ROUNDS, -1, -1):
+            for word in encrypt_words[4 * round_num:4 * round_num + 4]:
+                if 0 < round_num < ROUNDS:
+                    word = (TD0[SBOX[word >> 24]] ^ TD1[SBOX[(word >> 16) & 0xFF]] ^
+                            TD2[SBOX[(word >> 8) & 0xFF]] ^ TD3[SBOX[word & 0xFF]])
+                decrypt_words.append(word)
+        return encrypt_words, decrypt_words
+
+    def encrypt_blocks(self, schedule, data):
+        rk = schedule[0]
+        te0, te1, te2, te3, sbox = TE0, TE1, TE2, TE3, SBOX
+        final_key = ((rk[-4] << 96) | (rk[-3] << 64) | (rk[-2] << 32) | rk[-1]).to_bytes(16, 'big')
+        out = []
+        for offset in range(0, len(data), BLOCK_SIZE):
+            s0 = int.from_bytes(data[offset:offset + 4], 'big') ^ rk[0]
+            s1 = int.from_bytes(data[offset + 4:offset + 8], 'big') ^ rk[1]
+            s2 = int.from_bytes(data[offset + 8:offset + 12], 'big') ^ rk[2]
+            s3 = int.from_bytes(data[offset + 12:offset + 16], 'big') ^ rk[3]
+            k = 4
+            for _ in range(ROUNDS - 1):
+                t0 = te0[s0 >> 24] ^ te1[(s1 >> 16) & 0xFF] ^ te2[(s2 >> 8) & 0xFF] ^ te3[s3 & 0xFF] ^ rk[k]
+                t1 = te0[s1 >> 24] ^ te1[(s2 >> 16) & 0xFF] ^ te2[(s3 >> 8) & 0xFF] ^ te3[s0 & 0xFF] ^ rk[k + 1]
+                t2 = te0[s2 >> 24] ^ te1[(s3 >> 16) & 0xFF] ^ te2[(s0 >> 8) & 0xFF] ^ te3[s1 & 0xFF] ^ rk[k + 2]
+                t3 = te0[s3 >> 24] ^ te1[(s0 >> 16) & 0xFF] ^ te2[(s1 >> 8) & 0xFF] ^ te3[s2 & 0xFF] ^ rk[k + 3]
+                s0, s1, s2, s3 = t0, t1, t2, t3
+                k += 4
+            # Final round: SubBytes + ShiftRows + AddRoundKey, no MixColumns
+            block = bytes([
+                sbox[s0 >> 24], sbox[(s1 >> 16) & 0xFF], sbox[(s2 >> 8) & 0xFF], sbox[s3 & 0xFF],
+                sbox[s1 >> 24], sbox[(s2 >> 16) & 0xFF], sbox[(s3 >> 8) & 0xFF], sbox[s0 & 0xFF],
+                sbox[s2 >> 24], sbox[(s3 >> 16) & 0xFF], sbox[(s0 >> 8) & 0xFF], sbox[s1 & 0xFF],
+                sbox[s3 >> 24], sbox[(s0 >> 16) & 0xFF], sbox[(s1 >> 8) & 0xFF], sbox[s2 & 0xFF],
+            ])
+            out.append(_xor_bytes(block, final_key))
+        return b''.join(out)
+
+    def decrypt_blocks(self, schedule, data):
+        rk = schedule[1]
+        td0, td1, td2, td3, inv_sbox = TD0, TD1, TD2, TD3, INV_SBOX
+        final_key = ((rk[-4] << 96) | (rk[-3] << 64) | (rk[-2] << 32) | rk[-1]).to_bytes(16, 'big')
+        out = []
+        for offset in range(0, len(data), BLOCK_SIZE):
+            s0 = int.from_bytes(data[offset:offset + 4], 'big') ^ rk[0]
+            s1 = int.from_bytes(data[offset + 4:offset + 8], 'big') ^ rk[1]
+            s2 = int.from_bytes(data[offset + 8:offset + 12], 'big') ^ rk[2]
+            s3 = int.from_bytes(data[offset + 12:offset + 16], 'big') ^ rk[3]
+            k = 4
+            for _ in range(ROUNDS - 1):
+                t0 = td0[s0 >> 24] ^ td1[(s3 >> 16) & 0xFF] ^ td2[(s2 >> 8) & 0xFF] ^ td3[s1 & 0xFF] ^ rk[k]
+                t1 = td0[s1 >> 24] ^ td1[(s0 >> 16) & 0xFF] ^ td2[(s3 >> 8) & 0xFF] ^ td3[s2 & 0xFF] ^ rk[k + 1]
+                t2 = td0[s2 >> 24] ^ td1[(s1 >> 16) & 0xFF] ^ td2[(s0 >> 8) & 0xFF] ^ td3[s3 & 0xFF] ^ rk[k + 2]
+                t3 = td0[s3 >> 24] ^ td1[(s2 >> 16) & 0xFF] ^ td2[(s1 >> 8) & 0xFF] ^ td3[s0 & 0xFF] ^ rk[k + 3]
+                s0, s1, s2, s3 = t0, t1, t2, t3
+                k += 4
+            block = bytes([
+                inv_sbox[s0 >> 24], inv_sbox[(s3 >> 16) & 0xFF], inv_sbox[(s2 >> 8) & 0xFF], inv_sbox[s1 & 0xFF],
+                inv_sbox[s1 >> 24], inv_sbox[(s0 >> 16) & 0xFF], inv_sbox[(s3 >> 8) & 0xFF], inv_sbox[s2 & 0xFF],
+                inv_sbox[s2 >> 24], inv_sbox[(s1 >> 16) & 0xFF], inv_sbox[(s0 >> 8) & 0xFF], inv_sbox[s3 & 0xFF],
+                inv_sbox[s3 >> 24], inv_sbox[(s2 >> 16) & 0xFF], inv_sbox[(s1 >> 8) & 0xFF], inv_sbox[s0 & 0xFF],
+            ])
+            out.append(_xor_bytes(block, final_key))
+        return b''.join(out)
+
+
+def _linear_map_rows(function):
+    """
+    Express a GF(2)-linear byte map as, for each output bit, the input bits
+    that are XORed together to produce it.
+    """
+    columns = [function(1 << bit) for bit in range(8)]
+    return [[bit for bit in range(8) if columns[bit] >> out_bit & 1] for out_bit in range(8)]
+
+
+def _affine(x):
+    result = x
+    for shift in range(1, 5):
+        result ^= ((x << shift) | (x >> (8 - shift))) & 0xFF
+    return result
+
+
+def _inverse_affine(x):
+    return ((x << 1 | x >> 7) ^ (x << 3 | x >> 5) ^ (x << 6 | x >> 2)) & 0xFF
+
+
+# Linear maps used by the bit-sliced S-box, derived from the field arithmetic
+SQUARE_ROWS = _linear_map_rows(lambda x: _gf_mul(x, x))
+AFFINE_ROWS = _linear_map_rows(_affine)
+INVERSE_AFFINE_ROWS = _linear_map_rows(_inverse_affine)
+
+# ShiftRows on a column-major state: output byte i comes from input byte SHIFT_ROWS[i]
+SHIFT_ROWS = [(i + 4 * (i % 4)) % 16 for i in range(16)]
+INV_SHIFT_ROWS = [SHIFT_ROWS.index(i) for i in range(16)]
+
+
+class BitslicedBackend:
+    """
+    NumPy bit-sliced AES. The state of N blocks is stored as 128 bit-planes
+    (8 bits x 16 byte positions), each plane holding that bit for every
+    block, so every Boolean operation processes all blocks at once.
+    SubBytes is computed as a Boolean circuit (GF(2^8) inversion by the
+    addition chain x^254, then the affine map) instead of a table lookup.
+    """
+
+    name = 'bitslice'
+    modes = REFERENCE_MODES
+
+    def __init__(self):
+        import numpy
+
+        self.np = numpy
+
+    def new_cipher(self, key, mode, iv=None):
+        return _BlockModeCipher(self, key, mode, iv)
+
+    def prepare_key(self, key):
+        np = self.np
+        words = expand_key(key)
+        round_keys = [b''.join(word.to_bytes(4, 'big') for word in words[4 * r:4 * r + 4])
+                      for r in range(ROUNDS + 1)]
+        # For every round: a (8, 16, 1) all-ones/all-zeros mask per key bit, ready to XOR into the planes
+        masks = []
+        for round_key in round_keys:
+            key_bytes = np.frombuffer(round_key, dtype=np.uint8)
+            bits = (key_bytes[None, :] >> np.arange(8, dtype=np.uint8)[:, None]) & 1
+            masks.append((bits * np.uint64(0xFFFFFFFFFFFFFFFF)).astype(np.uint64)[:, :, None])
+        return masks
+
+    def _to_planes(self, data):
+        np = self.np
+        num_blocks = len(data) // BLOCK_SIZE
+        padded_blocks = -(-num_blocks // 64) * 64
+        state = np.zeros((padded_blocks, BLOCK_SIZE), dtype=np.uint8)
+        state[:num_blocks] = np.frombuffer(data, dtype=np.uint8).reshape(num_blocks, BLOCK_SIZE)
+        bits = (state[None, :, :] >> np.arange(8, dtype=np.uint8)[:, None, None]) & 1
+        # Pack the block axis: plane[bit, byte, word] holds 64 blocks per uint64
+        packed = np.packbits(bits.transpose(0, 2, 1), axis=2, bitorder='little')
+        return [plane for plane in packed.view(np.uint64)], num_blocks
+
+    def _from_planes(self, planes, num_blocks):
+        np = self.np
+        packed = np.stack(planes).view(np.uint8)
+        bits = np.unpackbits(packed, axis=2, bitorder='little')
+        state = np.zeros(bits.shape[2:0:-1], dtype=np.uint8)
+        for bit in range(8):
+            state |= bits[bit].T << np.uint8(bit)
+        return state[:num_blocks].tobytes()
+
+    @staticmethod
+    def _linear(planes, rows):
+        result = []
+        for sources in rows:
+            value = planes[sources[0]].copy()
+            for source in sources[1:]:
+                value ^= planes[source]
+            result.append(value)
+        return result
+
+    def _gf_multiply(self, a, b):
+        # Schoolbook carry-less product, then reduce x^8 = x^4 + x^3 + x + 1
+        product = [None] * 15
+        for i in range(8):
+            for j in range(8):
+                term = a[i] & b[j]
+                product[i + j] = term if product[i + j] is None else product[i + j] ^ term
+        for k in range(14, 7, -1):
+            for target in (k - 4, k - 5, k - 7, k - 8):
+                product[target] ^= product[k]
+        return product[:8]
+
+    def _gf_inverse(self, x):
+        # x^254 = x^-1 (and 0 -> 0) via x^3, x^12, x^15, x^240, x^252, x^254
+        x2 = self._linear(x, SQUARE_ROWS)
+        x3 = self._gf_multiply(x2, x)
+        x12 = self._linear(self._linear(x3, SQUARE_ROWS), SQUARE_ROWS)
+        x15 = self._gf_multiply(x12, x3)
+        x240 = x15
+        for _ in range(4):
+            x240 = self._linear(x240, SQUARE_ROWS)
+        x252 = self._gf_multiply(x240, x12)
+        return self._gf_multiply(x252, x2)
+
+    def _sub_bytes(self, planes):
+        result = self._linear(self._gf_inverse(planes), AFFINE_ROWS)
+        for bit in (0, 1, 5, 6):  # + 0x63
+            result[bit] = ~result[bit]
+        return result
+
+    def _inv_sub_bytes(self, planes):
+        shifted = self._linear(planes, INVERSE_AFFINE_ROWS)
+        for bit in (0, 2):  # + 0x05, the inverse affine constant
+            shifted[bit] = ~shifted[bit]
+        return self._gf_inverse(shifted)
+
+    @staticmethod
+    def _xtime(planes):
+        return [planes[7], planes[0] ^ planes[7], planes[1], planes[2] ^ planes[7],
+                planes[3] ^ planes[7], planes[4], planes[5], planes[6]]
+
+    def _mix_columns(self, planes):
+        # Byte positions are column-major: rotate rows within each column
+        def rotate(p, n):
+            return p.reshape(4, 4, -1)[:, [(r + n) % 4 for r in range(4)], :].reshape(16, -1)
+
+        doubled = self._xtime(planes)
+        return [doubled[b] ^ rotate(doubled[b], 1) ^ rotate(planes[b], 1) ^
+                rotate(planes[b], 2) ^ rotate(planes[b], 3) for b in range(8)]
+
+    def _inv_mix_columns(self, planes):
+        # InvMixColumns = MixColumns after multiplying (rows 0,2) and (rows 1,3) pairs by 4
+        def rotate(p, n):
+            return p.reshape(4, 4, -1)[:, [(r + n) % 4 for r in range(4)], :].reshape(16, -1)
+
+        quadrupled = self._xtime(self._xtime([plane ^ rotate(plane, 2) for plane in planes]))
+        return self._mix_columns([planes[b] ^ quadrupled[b] for b in range(8)])
+
+    def encrypt_blocks(self, masks, data):
+        planes, num_blocks = self._to_planes(data)
+        planes = [planes[b] ^ masks[0][b] for b in range(8)]
+        for round_num in range(1, ROUNDS + 1):
+            planes = [plane[SHIFT_ROWS] for plane in self._sub_bytes(planes)]
+            if round_num != ROUNDS:
+                planes = self._mix_columns(planes)
+            planes = [planes[b] ^ masks[round_num][b] for b in range(8)]
+        return self._from_planes(planes, num_blocks)
+
+    def decrypt_blocks(self, masks, data):
+        planes, num_blocks = self._to_planes(data)
+        planes = [planes[b] ^ masks[ROUNDS][b] for b in range(8)]
+        for round_num in range(ROUNDS - 1, -1, -1):
+            planes = self._inv_sub_bytes([plane[INV_SHIFT_ROWS] for plane in planes])
+            planes = [planes[b] ^ masks[round_num][b] for b in range(8)]
+            if round_num != 0:
+                planes = self._inv_mix_columns(planes)
+        return self._from_planes(planes, num_blocks)
+
+
+BACKENDS = {
+    'pycryptodome': PycryptodomeBackend,
+    'ttable': TTableBackend,
+    'bitslice': BitslicedBackend,
+}
+
+_instances = {}
+
+
+def get_backend(name='pycryptodome'):
+    """
+    Return the shared backend instance for name
+
+    Raises:
+        ValueError: Unknown backend, or its optional dependency (NumPy) is missing
+    """
+    backend = _instances.get(name)
+    if backend is None:
+        if name not in BACKENDS:
+            raise ValueError(f"Backend must be one of: {', '.join(BACKENDS)}")
+        try:
+            backend = BACKENDS[name]()
+        except ImportError as e:
+            raise ValueError(f"The {name} backend is unavailable: {e}")
+        _instances[name] = backend
+    return backend
+
+
+# FIPS-197 Appendix C.3 AES-256 known-answer vector
+KNOWN_ANSWER = (bytes(range(32)), bytes.fromhex('00112233445566778899aabbccddeeff'),
+                bytes.fromhex('8ea2b7ca516745bfeafc49904b496089'))
+
+
+def verify_backends(names=None, sizes=(16, 100, 2080), modes=REFERENCE_MODES):
+    """
+    Cross-check backends against the FIPS-197 vector and against each other.
+    The default sizes include a partial block and more than 64 blocks, so the
+    bit-sliced backend is checked across a word boundary.
+
+    Returns:
+        list: Mismatch descriptions (empty when every backend agrees)
+    """
+    import os
+
+    names = names or list(BACKENDS)
+    problems = []
+    key, plaintext, expected = KNOWN_ANSWER
+    for name in names:
+        backend = get_backend(name)
+        if backend.new_cipher(key, 'ECB').encrypt(plaintext) != expected:
+            problems.append(f"{name}: FIPS-197 known-answer test failed")
+
+    key = os.urandom(32)
+    iv = os.urandom(16)
+    reference = get_backend('pycryptodome')
+    for mode in modes:
+        for size in sizes:
+            if mode == 'CFB':
+                # CFB-8 costs one block encryption per byte; short inputs cover it
+                size = min(size, 100)
+            data = os.urandom(size - size % BLOCK_SIZE if mode in ['ECB', 'CBC'] else size)
+            expected = reference.new_cipher(key, mode, iv).encrypt(data)
+            for name in names:
+                backend = get_backend(name)
+                if mode not in backend.modes:
+                    continue
+                if backend.new_cipher(key, mode, iv).encrypt(data) != expected:
+                    problems.append(f"{name}: {mode} encryption of {len(data)} bytes differs from pycryptodome")
+                elif backend.new_cipher(key, mode, iv).decrypt(expected) != data:
+                    problems.append(f"{name}: {mode} decryption of {len(data)} bytes does not round-trip")
+    return problems
@@ -0,0 +1,480 @@
+#!/usr/bin/env python3
+"""
+Command-line bulk encryption/decryption built on AES256WithSteps
+
+Encrypts or decrypts files, directories (recursively) and stdin → stdout
+pipes in any supported mode. Input is processed in chunks; every chunk is
+encrypted independently with a fresh random IV/nonce and written as a
+length-prefixed frame:
+
+    header: b'AES256' + version byte + 3-byte mode name + 16-byte random stream id
+    frame:  4-byte big-endian length + IV/Nonce + Ciphertext [+ Tag]
+
+In GCM, EAX and SIV every frame also authenticates its position, STREAM
+style: the associated data of frame i is
+
+    header + 8-byte big-endian i + final flag byte (1 on the last frame) + --aad
+
+so reordered, dropped or truncated frames fail authentication, as do frames
+spliced in from another file (its stream id differs), and an AEAD
+file always ends with a final frame (empty input gives one empty frame).
+The other modes have no integrity protection at all.
+
+Examples:
+    python aes_cli.py encrypt -k MySecretKey123456789012345678901 -m GCM report.pdf
+    python aes_cli.py decrypt -k MySecretKey123456789012345678901 report.pdf.aes
+    tar c docs | python aes_cli.py encrypt --key-file key.bin -m CTR > docs.tar.aes
+    python aes_cli.py encrypt -k ... -j 8 -o encrypted/ photos/
+"""
+
+import argparse
+import itertools
+import os
+import shutil
+import sys
+
+from aes_engine import AES256WithSteps
+
+MAGIC = b'AES256'
+FORMAT_VERSION = 2
+STREAM_ID_SIZE = 16
+HEADER_SIZE = len(MAGIC) + 1 + 3 + STREAM_ID_SIZE
+FRAME_LENGTH_SIZE = 4
+MIN_CHUNK_SIZE = 16  # The traced engine requires at least one AES block of input
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+# Largest chunk encrypted with --trace: a trace takes several hundred bytes
+# per input byte and each chunk's steps are held until the chunk is written
+TRACE_CHUNK_SIZE = 16 * 1024
+FILE_SUFFIX = '.aes'
+MODES = ['ECB', 'CBC', 'CFB', 'OFB', 'CTR', 'GCM', 'EAX', 'SIV']
+AEAD_MODES = ['GCM', 'EAX', 'SIV']
+
+
+def parse_size(value):
+    """argparse type for a byte count with an optional K/M/G suffix (e.g. 64K, 4M)"""
+    units = {'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+    text = value.strip().upper()
+    try:
+        if text and text[-1] in units:
+            size = int(text[:-1]) * units[text[-1]]
+        else:
+            size = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid size: {value}")
+    if size < 0:
+        raise argparse.ArgumentTypeError(f"size cannot be negative: {value}")
+    return size
+
+
+def _parse_chunk_size(value):
+    size = parse_size(value)
+    if size < MIN_CHUNK_SIZE:
+        raise argparse.ArgumentTypeError(f"chunk size must be at least {MIN_CHUNK_SIZE} bytes")
+    return size
+
+
+def _read_chunks(stream, chunk_size):
+    """
+    Yield chunks of at most chunk_size bytes.
+    A trailing chunk shorter than one AES block is merged into the previous
+    one, since the engine rejects traced inputs under 16 bytes.
+    """
+    pending = stream.read(chunk_size)
+    while pending:
+        chunk = stream.read(chunk_size)
+        if chunk and len(chunk) < MIN_CHUNK_SIZE:
+            # A short read from a buffered stream means end of input
+            pending += chunk
+            chunk = b''
+        yield pending
+        pending = chunk
+
+
+def _read_frames(stream):
+    """Yield the payload of each length-prefixed frame"""
+    while True:
+        prefix = stream.read(FRAME_LENGTH_SIZE)
+        if not prefix:
+            return
+        if len(prefix) != FRAME_LENGTH_SIZE:
+            raise ValueError("Truncated frame header")
+        length = int.from_bytes(prefix, 'big')
+        payload = stream.read(length)
+        if len(payload) != length:
+            raise ValueError(f"Truncated frame: expected {length} bytes, got {len(payload)}")
+        yield payload
+
+
+def _with_last(items):
+    """Yield (index, item, is_last) for every item"""
+    iterator = iter(items)
+    pending = next(iterator, None)
+    index = 0
+    while pending is not None:
+        following = next(iterator, None)
+        yield index, pending, following is None
+        pending = following
+        index += 1
+
+
+def _frame_aad(header, index, final, aad):
+    """Associated data binding a frame to its file header and position"""
+    return header + index.to_bytes(8, 'big') + bytes([final]) + (aad or b'')
+
+
+def _pkcs7_pad(data):
+    """Always pad block-mode chunks so the engine strips exactly this padding on decryption"""
+    padding_length = 16 - (len(data) % 16)
+    return data + bytes([padding_length] * padding_length)
+
+
+def encrypt_stream(source, sink, key, mode, aad=None, chunk_size=DEFAULT_CHUNK_SIZE, trace=None,
+                   backend='pycryptodome'):
+    """
+    Encrypt everything read from source into framed ciphertext on sink.
+
+    Args:
+        source: Binary stream to read plaintext from
+        sink: Binary stream to write the framed ciphertext to
+        key (bytes): 32-byte AES-256 key
+        mode (str): Any mode supported by AES256WithSteps
+        aad (bytes): Associated data for GCM, EAX and SIV (each frame also binds its position)
+        chunk_size (int): Plaintext bytes per frame (at most TRACE_CHUNK_SIZE when tracing)
+        trace (list): If given, the steps of every chunk are appended to it as each
+            chunk finishes (a TraceWriter streams them to a file)
+        backend (str): Block cipher implementation, see aes_backends.BACKENDS
+
+    Returns:
+        int: Number of plaintext bytes processed
+    """
+    header = MAGIC + bytes([FORMAT_VERSION]) + mode.encode('ascii') + os.urandom(STREAM_ID_SIZE)
+    sink.write(header)
+    if trace is not None:
+        chunk_size = min(chunk_size, TRACE_CHUNK_SIZE)
+    chunks = _with_last(_read_chunks(source, chunk_size))
+    if mode in AEAD_MODES:
+        # Empty input still gets a final frame, so truncation to the header is detectable
+        first = next(chunks, (0, b'', True))
+        chunks = itertools.chain([first], chunks)
+    total = 0
+    for index, chunk, final in chunks:
+        frame_aad = _frame_aad(header, index, final, aad) if mode in AEAD_MODES else aad
+        data = _pkcs7_pad(chunk) if mode in ['ECB', 'CBC'] else chunk
+        # The traced engine needs one full block; only a whole input shorter
+        # than that (or an empty AEAD frame) reaches here, and runs untraced
+        traced = trace is not None and len(data) >= MIN_CHUNK_SIZE
+        aes = AES256WithSteps(key, mode, aad=frame_aad, trace=traced, backend=backend)
+        payload = aes.encrypt(data, raw=True, padding_length=len(data) - len(chunk))
+        sink.write(len(payload).to_bytes(FRAME_LENGTH_SIZE, 'big') + payload)
+        if trace is not None:
+            steps = aes.get_steps() if traced else [{
+                "step": "Untraced chunk",
+                "detail": f"{len(data)} bytes is shorter than one AES block ({MIN_CHUNK_SIZE} bytes), "
+                          f"so this chunk was encrypted without a step trace"}]
+            trace.append({"chunk": index, "steps": steps})
+        total += len(chunk)
+    return total
+
+
+def decrypt_stream(source, sink, key, mode=None, aad=None, trace=None, backend='pycryptodome'):
+    """
+    Decrypt framed ciphertext from source into plaintext on sink.
+
+    In AEAD modes a frame that fails authentication, or input that ends
+    without a final frame, raises ValueError; plaintext of the frames before
+    it has already been written to sink.
+
+    Args:
+        source: Binary stream to read the framed ciphertext from
+        sink: Binary stream to write plaintext to
+        key (bytes): 32-byte AES-256 key
+        mode (str): Expected mode; taken from the header when None
+        aad (bytes): Associated data for GCM, EAX and SIV
+        trace (list): If given, the steps of every chunk are appended to it as each
+            chunk finishes (a TraceWriter streams them to a file)
+        backend (str): Block cipher implementation, see aes_backends.BACKENDS
+
+    Returns:
+        int: Number of plaintext bytes written
+    """
+    header = source.read(HEADER_SIZE)
+    if len(header) != HEADER_SIZE or not header.startswith(MAGIC):
+        raise ValueError("Input is not in aes_cli format (bad header)")
+    if header[len(MAGIC)] != FORMAT_VERSION:
+        raise ValueError(f"Unsupported format version: {header[len(MAGIC)]}")
+    header_mode = header[len(MAGIC) + 1:len(MAGIC) + 4].decode('ascii', errors='replace')
+    if mode is None:
+        mode = header_mode
+    elif mode != header_mode:
+        raise ValueError(f"Input was encrypted in {header_mode} mode, not {mode}")
+
+    total = 0
+    final = False
+    for index, payload, final in _with_last(_read_frames(source)):
+        frame_aad = _frame_aad(header, index, final, aad) if mode in AEAD_MODES else aad
+        aes = AES256WithSteps(key, mode, aad=frame_aad, trace=trace is not None, backend=backend)
+        try:
+            plaintext = aes.decrypt(payload, raw=True)
+        except ValueError as e:
+            if mode in AEAD_MODES:
+                raise ValueError(f"Frame {index} failed authentication (wrong key or AAD, "
+                                 f"or frames were reordered or truncated): {e}")
+            raise
+        sink.write(plaintext)
+        if trace is not None:
+            trace.append({"chunk": index, "steps": aes.get_steps()})
+        total += len(plaintext)
+    if mode in AEAD_MODES and not final:
+        raise ValueError("Input is truncated: no final frame")
+    return total
+
+
+def _output_path(input_path, root, output, action):
+    """Map an input file to its output path, mirroring directory structure under output"""
+    if action == 'encrypt':
+        name = os.path.basename(input_path) + FILE_SUFFIX
+    else:
+        name = os.path.basename(input_path)
+        name = name[:-len(FILE_SUFFIX)] if name.endswith(FILE_SUFFIX) else name + '.dec'
+
+    if output is None:
+        return os.path.join(os.path.dirname(input_path), name)
+    if root is None:
+        # A single file argument: output may name the file or an existing directory
+        return os.path.join(output, name) if os.path.isdir(output) else output
+    relative_dir = os.path.relpath(os.path.dirname(input_path), root)
+    return os.path.normpath(os.path.join(output, os.path.basename(root), relative_dir, name))
+
+
+def _collect_jobs(paths, output, action):
+    """Expand file and directory arguments into (input, output) pairs"""
+    if output == '-':
+        raise ValueError("stdout ('-') output is only available for stdin input")
+    if output is not None and (len(paths) > 1 or os.path.isdir(paths[0])):
+        # Several inputs always land inside an output directory
+        os.makedirs(output, exist_ok=True)
+
+    jobs = []
+    for path in paths:
+        if os.path.isdir(path):
+            root = os.path.normpath(path)
+            for dirpath, _, filenames in os.walk(root):
+                for filename in sorted(filenames):
+                    if action == 'decrypt' and not filename.endswith(FILE_SUFFIX):
+                        continue
+                    input_path = os.path.join(dirpath, filename)
+                    jobs.append((input_path, _output_path(input_path, root, output, action)))
+        elif os.path.isfile(path):
+            jobs.append((path, _output_path(path, None, output, action)))
+        else:
+            raise ValueError(f"No such file or directory: {path}")
+    return jobs
+
+
+class TraceWriter:
+    """
+    Writes the trace of one input to a text file as each chunk is appended,
+    so memory use does not grow with the input size.
+
+    NDJSON gets one record per step. JSON gets an {"input", "chunks"} object;
+    run() wraps the objects of all inputs in one list.
+    """
+
+    def __init__(self, f, name, trace_format):
+        import json
+
+        self._json = json
+        self.f = f
+        self.name = name
+        self.trace_format = trace_format
+        self.chunks = 0
+        if trace_format == 'json':
+            f.write(json.dumps({"input": name}, ensure_ascii=False)[:-1] + ', "chunks": [')
+
+    def append(self, chunk):
+        if self.trace_format == 'json':
+            self.f.write((',\n' if self.chunks else '\n') + self._json.dumps(chunk, ensure_ascii=False))
+        else:
+            for step in chunk["steps"]:
+                record = {"input": self.name, "chunk": chunk["chunk"],
+                          "step": step["step"], "detail": step["detail"]}
+                self.f.write(self._json.dumps(record, ensure_ascii=False) + "\n")
+        self.chunks += 1
+
+    def close(self):
+        if self.trace_format == 'json':
+            self.f.write('\n]}')
+
+
+def process_file(action, input_path, output_path, key, mode, aad, chunk_size, trace_path=None,
+                 backend='pycryptodome', trace_format='ndjson'):
+    """
+    Encrypt or decrypt one file; runs in a worker process when -j > 1.
+
+    Args:
+        trace_path (str): If given, the trace of this file is written there (see TraceWriter)
+
+    Returns:
+        tuple: (input_path, bytes processed, error message or None)
+    """
+    trace_file = open(trace_path, 'w', encoding='utf-8') if trace_path else None
+    trace = TraceWriter(trace_file, input_path, trace_format) if trace_file else None
+    try:
+        directory = os.path.dirname(output_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Write to a temporary name so a failed run never leaves a truncated output behind
+        temp_path = output_path + '.part'
+        with open(input_path, 'rb') as source, open(temp_path, 'wb') as sink:
+            if action == 'encrypt':
+                total = encrypt_stream(source, sink, key, mode, aad, chunk_size, trace, backend)
+            else:
+                total = decrypt_stream(source, sink, key, mode, aad, trace, backend)
+        os.replace(temp_path, output_path)
+        return input_path, total, None
+    except (OSError, ValueError) as e:
+        if os.path.exists(output_path + '.part'):
+            os.remove(output_path + '.part')
+        return input_path, 0, str(e)
+    finally:
+        if trace_file is not None:
+            trace.close()
+            trace_file.close()
+
+
+def _merge_traces(path, part_paths, trace_format):
+    """Concatenate per-file trace parts into path (as one JSON list for 'json') and remove them"""
+    with open(path, 'w', encoding='utf-8') as f:
+        if trace_format == 'json':
+            f.write('[\n')
+        for i, part_path in enumerate(part_paths):
+            if trace_format == 'json' and i:
+                f.write(',\n')
+            with open(part_path, encoding='utf-8') as part:
+                shutil.copyfileobj(part, f)
+            os.remove(part_path)
+        if trace_format == 'json':
+            f.write('\n]\n')
+
+
+def _load_key(args):
+    if args.key_file:
+        with open(args.key_file, 'rb') as f:
+            key = f.read()
+        # Tolerate a trailing newline from `echo key > file`
+        key = key.rstrip(b'\r\n') if len(key) > 32 else key
+    else:
+        key = args.key.encode('utf-8')
+    if len(key) != 32:
+        raise ValueError(f"Key must be 32 bytes for AES-256, got {len(key)}")
+    return key
+
+
+def build_parser():
+    from aes_backends import BACKENDS
+
+    parser = argparse.ArgumentParser(
+        prog='aes_cli.py',
+        description="Bulk AES-256 encryption/decryption of files, directories and pipes.")
+    parser.add_argument('action', choices=['encrypt', 'decrypt'])
+    parser.add_argument('inputs', nargs='*', default=['-'],
+                        help="Files or directories to process, '-' for stdin (default)")
+    key_group = parser.add_mutually_exclusive_group(required=True)
+    key_group.add_argument('-k', '--key', help="32-character key")
+    key_group.add_argument('--key-file', help="File containing the 32-byte key")
+    parser.add_argument('-m', '--mode', type=str.upper, choices=MODES,
+                        help="Cipher mode (default: GCM for encryption, read from the header for decryption)")
+    parser.add_argument('--aad', help="Associated data for GCM, EAX and SIV")
+    parser.add_argument('-b', '--backend', choices=list(BACKENDS), default='pycryptodome',
+                        help="Block cipher implementation (default: pycryptodome; "
+                             "ttable and bitslice support ECB, CBC, CFB, OFB and CTR)")
+    parser.add_argument('-o', '--output',
+                        help="Output file or directory, '-' for stdout (default: next to each input)")
+    parser.add_argument('-c', '--chunk-size', type=_parse_chunk_size, default=DEFAULT_CHUNK_SIZE,
+                        help="Plaintext bytes per frame, accepts K/M/G suffixes (default: 1M)")
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1,
+                        help="Files processed in parallel (default: number of CPUs)")
+    parser.add_argument('--trace', metavar='PATH',
+                        help="Write the step-by-step trace to PATH (slow for large inputs; "
+                             f"encryption then uses chunks of at most {TRACE_CHUNK_SIZE // 1024}K)")
+    parser.add_argument('--trace-format', choices=['json', 'ndjson'],
+                        help="Trace format (default: from the PATH extension, else ndjson)")
+    parser.add_argument('-q', '--quiet', action='store_true', help="Only report errors")
+    return parser
+
+
+def run(args):
+    key = _load_key(args)
+    aad = args.aad.encode('utf-8') if args.aad else None
+    mode = args.mode if args.mode or args.action == 'decrypt' else 'GCM'
+    tracing = args.trace is not None
+    trace_format = args.trace_format or ('json' if tracing and args.trace.endswith('.json') else 'ndjson')
+    failures = 0
+
+    if args.inputs == ['-']:
+        trace_path = args.trace + '.0.part' if tracing else None
+        trace_file = open(trace_path, 'w', encoding='utf-8') if tracing else None
+        trace = TraceWriter(trace_file, '-', trace_format) if tracing else None
+        sink = sys.stdout.buffer if args.output in (None, '-') else open(args.output, 'wb')
+        try:
+            if args.action == 'encrypt':
+                encrypt_stream(sys.stdin.buffer, sink, key, mode, aad, args.chunk_size, trace, args.backend)
+            else:
+                decrypt_stream(sys.stdin.buffer, sink, key, mode, aad, trace, args.backend)
+            sink.flush()
+        finally:
+            if sink is not sys.stdout.buffer:
+                sink.close()
+            if tracing:
+                trace.close()
+                trace_file.close()
+                _merge_traces(args.trace, [trace_path], trace_format)
+    else:
+        if '-' in args.inputs:
+            raise ValueError("stdin ('-') cannot be combined with file inputs")
+        jobs = _collect_jobs(args.inputs, args.output, args.action)
+        # Each file's trace goes to its own part (workers write in parallel), merged in input order
+        trace_paths = [f'{args.trace}.{i}.part' if tracing else None for i in range(len(jobs))]
+        task_args = [(args.action, src, dst, key, mode, aad, args.chunk_size, trace_path, args.backend, trace_format)
+                     for (src, dst), trace_path in zip(jobs, trace_paths)]
+
+        if args.jobs > 1 and len(jobs) > 1:
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(max_workers=min(args.jobs, len(jobs))) as pool:
+                results = list(pool.map(process_file, *zip(*task_args)))
+        else:
+            results = [process_file(*task) for task in task_args]
+
+        for (input_path, total, error), (_, output_path) in zip(results, jobs):
+            if error:
+                failures += 1
+                print(f"aes_cli.py: {input_path}: {error}", file=sys.stderr)
+            elif not args.quiet:
+                print(f"{input_path} -> {output_path} ({total} bytes)", file=sys.stderr)
+        if tracing:
+            _merge_traces(args.trace, trace_paths, trace_format)
+
+    return 1 if failures else 0
+
+
+def main(argv=None):
+    parser = build_parser()
+    # Allow options before and after the input list
+    args = parser.parse_intermixed_args(argv)
+    try:
+        return run(args)
+    except BrokenPipeError:
+        # Downstream closed the pipe (e.g. `| head`); silence the flush at interpreter exit
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 1
+    except KeyboardInterrupt:
+        return 130
+    except (OSError, ValueError) as e:
+        print(f"aes_cli.py: error: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,24 +1,65 @@
 # aes_engine.py
-from Crypto.Cipher import AES
-from Crypto.Util.Padding import pad, unpad
-from Crypto.Random import get_random_bytes
+# pycryptodome modules are imported where they are first needed, so callers
+# that only validate input or format traces don't pay for loading them
 import base64
 import binascii
-import struct
+
+BLOCK_SIZE = 16
+
+# Static round explanations, built once instead of for every round of every block
+ENCRYPTION_ROUND_DETAILS = {
+    round_num: (f"Step 1: SubBytes - Apply S-box substitution\n"
+                f"  • Each byte replaced using AES S-box lookup table\n"
+                f"  • Provides non-linearity and confusion\n"
+                f"Step 2: ShiftRows - Cyclically shift rows\n"
+                f"  • Row 0: No shift, Row 1: Left shift 1\n"
+                f"  • Row 2: Left shift 2, Row 3: Left shift 3\n"
+                f"  • Provides diffusion across columns\n"
+                f"Step 3: MixColumns - Matrix multiplication\n"
+                f"  • Each column multiplied by fixed matrix in GF(2^8)\n"
+                f"  • Further diffusion within columns\n"
+                f"Step 4: AddRoundKey - XOR with round key\n"
+                f"  • State ⊕ RoundKey[{round_num}]\n"
+                f"  • Incorporates round-specific key material")
+    for round_num in range(1, 14)
+}
+
+DECRYPTION_ROUND_DETAILS = {
+    round_num: (f"Step 1: AddRoundKey - XOR with round key\n"
+                f"  • State ⊕ RoundKey[{round_num}]\n"
+                f"Step 2: InvMixColumns - Inverse matrix multiplication\n"
+                f"  • Each column multiplied by inverse matrix in GF(2^8)\n"
+                f"  • Reverses the MixColumns transformation\n"
+                f"Step 3: InvShiftRows - Reverse cyclical shift\n"
+                f"  • Row 0: No shift, Row 1: Right shift 1\n"
+                f"  • Row 2: Right shift 2, Row 3: Right shift 3\n"
+                f"Step 4: InvSubBytes - Apply inverse S-box\n"
+                f"  • Each byte replaced using inverse S-box\n"
+                f"  • Reverses the SubBytes transformation")
+    for round_num in range(13, 0, -1)
+}
 
 class AES256WithSteps:
-    def __init__(self, key, mode='ECB', iv=None):
+    def __init__(self, key, mode='ECB', iv=None, aad=None, trace=True, backend='pycryptodome'):
         """
         Initialize AES-256 cipher with step tracking
         
         Args:
             key (bytes): 32-byte key for AES-256
-            mode (str): 'ECB', 'CBC', 'CFB', 'OFB', or 'CTR'
+            mode (str): 'ECB', 'CBC', 'CFB', 'OFB', 'CTR', 'GCM', 'EAX', or 'SIV'
             iv (bytes): Initialization vector/nonce (16 bytes)
+            aad (bytes): Associated data authenticated but not encrypted (GCM, EAX, SIV only)
+            trace (bool): Record step-by-step details (disable for bulk processing)
+            backend (str): Block cipher implementation, see aes_backends.BACKENDS
         """
         self.key = key
         self.mode = mode.upper()
-        self.iv = iv if iv else get_random_bytes(16)
+        if not iv:
+            from Crypto.Random import get_random_bytes
+            iv = get_random_bytes(16)
+        self.iv = iv
+        self.aad = aad if aad else b''
+        self.trace = trace
         self.steps = []
         
         # Validate key length
@@ -26,22 +67,96 @@ class AES256WithSteps:
             raise ValueError("Key must be 32 bytes for AES-256")
         
         # Validate mode
-        if self.mode not in ['ECB', 'CBC', 'CFB', 'OFB', 'CTR']:
-            raise ValueError("Mode must be one of: ECB, CBC, CFB, OFB, CTR")
+        if self.mode not in ['ECB', 'CBC', 'CFB', 'OFB', 'CTR', 'GCM', 'EAX', 'SIV']:
+            raise ValueError("Mode must be one of: ECB, CBC, CFB, OFB, CTR, GCM, EAX, SIV")
         
         # Validate IV/nonce for modes that require it
-        if self.mode in ['CBC', 'CFB', 'OFB', 'CTR'] and len(self.iv) != 16:
+        if self.mode in ['CBC', 'CFB', 'OFB', 'CTR', 'GCM', 'EAX', 'SIV'] and len(self.iv) != 16:
             raise ValueError(f"IV/Nonce must be 16 bytes for {self.mode} mode")
+        
+        # Associated data only makes sense for authenticated modes
+        if self.aad and self.mode not in ['GCM', 'EAX', 'SIV']:
+            raise ValueError(f"Associated data is only supported in GCM, EAX and SIV modes, not {self.mode}")
+        
+        # Resolve the backend last so an invalid mode is reported first
+        from aes_backends import get_backend
+        
+        self.backend = get_backend(backend)
+        if self.mode not in self.backend.modes:
+            raise ValueError(f"The {self.backend.name} backend supports {', '.join(self.backend.modes)}, not {self.mode}")
     
     def _log_step(self, step_name, detail):
         """Log a step in the AES process"""
+        if not self.trace:
+            return
         self.steps.append({
             "step": step_name,
             "detail": detail
         })
     
+    def _siv_key(self):
+        """
+        Derive the double-length key required by SIV mode.
+        AES-256-SIV uses two independent 256-bit keys (one for S2V/CMAC,
+        one for CTR), so both halves are expanded from the 32-byte key
+        with HKDF-SHA512.
+        """
+        from Crypto.Hash import SHA512
+        from Crypto.Protocol.KDF import HKDF
+        
+        return HKDF(self.key, 64, b'', SHA512, context=b'AES-256-SIV')
+    
+    def _new_cipher(self, iv):
+        """Create the mode object on the selected backend, with AAD already absorbed"""
+        key = self._siv_key() if self.mode == 'SIV' else self.key
+        cipher = self.backend.new_cipher(key, self.mode, iv)
+        if self.mode in ['GCM', 'EAX', 'SIV']:
+            cipher.update(self.aad)
+        return cipher
+    
+    def _log_aead_authentication(self, data_length, step_number):
+        """Log the authentication pass (GHASH, OMAC or S2V) of an AEAD mode"""
+        if not self.trace:
+            return
+        
+        block_size = BLOCK_SIZE
+        aad_blocks = (len(self.aad) + block_size - 1) // block_size
+        data_blocks = (data_length + block_size - 1) // block_size
+        
+        if self.mode == 'GCM':
+            # GHASH absorbs AAD blocks, ciphertext blocks and a final length block
+            progress = []
+            for i in range(aad_blocks):
+                progress.append(f"  • AAD block {i+1}/{aad_blocks} absorbed (X = (X ⊕ A{i+1}) · H)")
+            for i in range(data_blocks):
+                progress.append(f"  • Ciphertext block {i+1}/{data_blocks} absorbed (X = (X ⊕ C{i+1}) · H)")
+            progress.append("  • Length block len(A) || len(C) absorbed")
+            self._log_step(f"{step_number}. GHASH Authentication",
+                          f"Hash subkey H = AES(K, 0^128)\n"
+                          f"AAD length: {len(self.aad)} bytes ({aad_blocks} blocks)\n"
+                          f"Ciphertext length: {data_length} bytes ({data_blocks} blocks)\n"
+                          f"GF(2^128) multiplications: {aad_blocks + data_blocks + 1}\n"
+                          f"GHASH progress:\n" + "\n".join(progress) + "\n"
+                          f"Tag = GHASH ⊕ AES(K, J0)")
+        elif self.mode == 'EAX':
+            self._log_step(f"{step_number}. OMAC Authentication",
+                          f"N' = OMAC0(Nonce), H' = OMAC1(AAD), C' = OMAC2(Ciphertext)\n"
+                          f"AAD length: {len(self.aad)} bytes ({aad_blocks} blocks)\n"
+                          f"Ciphertext length: {data_length} bytes ({data_blocks} blocks)\n"
+                          f"Tag = N' ⊕ H' ⊕ C'")
+        else:
+            self._log_step(f"{step_number}. S2V Authentication",
+                          f"S2V computes a CMAC chain over AAD, nonce and plaintext\n"
+                          f"AAD length: {len(self.aad)} bytes ({aad_blocks} blocks)\n"
+                          f"Plaintext length: {data_length} bytes ({data_blocks} blocks)\n"
+                          f"Synthetic IV = S2V(K1, AAD, Nonce, Plaintext) is also the tag\n"
+                          f"CTR keystream is started from the synthetic IV")
+    
     def _bytes_to_hex(self, data):
         """Convert bytes to hex string for display"""
+        if not self.trace:
+            # Hex strings only feed the trace, so skip the O(n) work when it is off
+            return ""
         return binascii.hexlify(data).decode('utf-8').upper()
     
     def _format_state(self, state):
@@ -103,19 +218,7 @@ class AES256WithSteps:
             # Main rounds (1-13) - Full rounds with all 4 operations
             for round_num in range(1, 14):
                 self._log_step(f"6.{block_num}.{3+round_num}. Round {round_num}",
-                              f"Step 1: SubBytes - Apply S-box substitution\n"
-                              f"  • Each byte replaced using AES S-box lookup table\n"
-                              f"  • Provides non-linearity and confusion\n"
-                              f"Step 2: ShiftRows - Cyclically shift rows\n"
-                              f"  • Row 0: No shift, Row 1: Left shift 1\n"
-                              f"  • Row 2: Left shift 2, Row 3: Left shift 3\n"
-                              f"  • Provides diffusion across columns\n"
-                              f"Step 3: MixColumns - Matrix multiplication\n"
-                              f"  • Each column multiplied by fixed matrix in GF(2^8)\n"
-                              f"  • Further diffusion within columns\n"
-                              f"Step 4: AddRoundKey - XOR with round key\n"
-                              f"  • State ⊕ RoundKey[{round_num}]\n"
-                              f"  • Incorporates round-specific key material")
+                              ENCRYPTION_ROUND_DETAILS[round_num])
             
             # Final round (14) - No MixColumns
             self._log_step(f"6.{block_num}.17. Final Round (Round 14)",
@@ -145,17 +248,7 @@ class AES256WithSteps:
             # Reverse main rounds (13 down to 1)
             for round_num in range(13, 0, -1):
                 self._log_step(f"6.{block_num}.{18-round_num}. Reverse Round {round_num}",
-                              f"Step 1: AddRoundKey - XOR with round key\n"
-                              f"  • State ⊕ RoundKey[{round_num}]\n"
-                              f"Step 2: InvMixColumns - Inverse matrix multiplication\n"
-                              f"  • Each column multiplied by inverse matrix in GF(2^8)\n"
-                              f"  • Reverses the MixColumns transformation\n"
-                              f"Step 3: InvShiftRows - Reverse cyclical shift\n"
-                              f"  • Row 0: No shift, Row 1: Right shift 1\n"
-                              f"  • Row 2: Right shift 2, Row 3: Right shift 3\n"
-                              f"Step 4: InvSubBytes - Apply inverse S-box\n"
-                              f"  • Each byte replaced using inverse S-box\n"
-                              f"  • Reverses the SubBytes transformation")
+                              DECRYPTION_ROUND_DETAILS[round_num])
             
             # Final decryption step - remove initial round key
             self._log_step(f"6.{block_num}.17. Final Decryption Step",
@@ -168,13 +261,17 @@ class AES256WithSteps:
         """
         Process blocks with detailed step-by-step logging
         """
+        if not self.trace:
+            # Purely descriptive, the real processing happens in encrypt()/decrypt()
+            return padded_data
+        
         if self.mode in ['ECB', 'CBC']:
-            num_blocks = len(padded_data) // AES.block_size
+            num_blocks = len(padded_data) // BLOCK_SIZE
             result_blocks = []
             
             for i in range(num_blocks):
-                block_start = i * AES.block_size
-                block_end = block_start + AES.block_size
+                block_start = i * BLOCK_SIZE
+                block_end = block_start + BLOCK_SIZE
                 input_block = padded_data[block_start:block_end]
                 
                 # Log block start
@@ -232,20 +329,56 @@ class AES256WithSteps:
             
             return padded_data  # Placeholder
     
-    def encrypt(self, plaintext):
+    def _log_block_results(self, input_data, output_data, is_encryption=True):
+        """Log the real input/output of every block after the cipher has run"""
+        if not self.trace:
+            return
+        
+        num_blocks = len(input_data) // BLOCK_SIZE
+        for i in range(num_blocks):
+            block_start = i * BLOCK_SIZE
+            block_end = block_start + BLOCK_SIZE
+            input_block = input_data[block_start:block_end]
+            output_block = output_data[block_start:block_end]
+            
+            if is_encryption:
+                comparison = self._compare_blocks(input_block, output_block, "encryption")
+                self._log_step(f"6.{i+1}.19. Block {i+1} Final Result",
+                              f"📥 Original input: {self._bytes_to_hex(input_block)}\n"
+                              f"📤 Final ciphertext: {self._bytes_to_hex(output_block)}\n"
+                              f"📊 Input matrix:\n{self._format_state(input_block)}\n"
+                              f"📊 Output matrix:\n{self._format_state(output_block)}\n"
+                              f"{comparison}")
+            else:
+                comparison = self._compare_blocks(input_block, output_block, "decryption")
+                self._log_step(f"5.{i+1}.19. Block {i+1} Decryption Result",
+                              f"📥 Ciphertext input: {self._bytes_to_hex(input_block)}\n"
+                              f"📤 Decrypted output: {self._bytes_to_hex(output_block)}\n"
+                              f"📊 Input matrix:\n{self._format_state(input_block)}\n"
+                              f"📊 Output matrix:\n{self._format_state(output_block)}\n"
+                              f"{comparison}")
+    
+    def encrypt(self, plaintext, raw=False, padding_length=0):
         """
         Encrypt plaintext using AES-256
         
         Args:
-            plaintext (str): Text to encrypt
+            plaintext (str or bytes): Text or raw data to encrypt
+            raw (bool): Return the ciphertext bytes instead of Base64 text
+            padding_length (int): Bytes of PKCS7 padding the caller already appended
+                to plaintext (ECB/CBC); the trace then shows them as padding
             
         Returns:
-            str: Base64 encoded ciphertext
+            str: Base64 encoded ciphertext (bytes when raw is True)
         """
         self.steps = []  # Reset steps
         
         # Step 1: Convert plaintext to bytes
-        plaintext_bytes = plaintext.encode('utf-8')
+        if isinstance(plaintext, bytes):
+            plaintext_bytes = plaintext
+            plaintext = plaintext.decode('utf-8', errors='replace') if self.trace else ""
+        else:
+            plaintext_bytes = plaintext.encode('utf-8')
         self._log_step("1. Input Preparation", 
                       f"Plaintext: {plaintext}\n"
                       f"Plaintext bytes: {self._bytes_to_hex(plaintext_bytes)}\n"
@@ -255,15 +388,19 @@ class AES256WithSteps:
         self._log_step("2. Key Preparation",
                       f"Key: {self.key.decode('utf-8', errors='ignore')}\n"
                       f"Key bytes: {self._bytes_to_hex(self.key)}\n"
-                      f"Key length: {len(self.key)} bytes (256-bit)")
+                      f"Key length: {len(self.key)} bytes (256-bit)\n"
+                      f"Backend: {self.backend.name}")
         
         # Step 3: Input validation and processing (minimum 16 bytes required)
-        if len(plaintext_bytes) < 16:
+        # The minimum guarantees the trace has at least one full block to show,
+        # so untraced bulk callers may encrypt shorter inputs
+        if self.trace and len(plaintext_bytes) < 16:
             raise ValueError(f"Input must be at least 16 bytes. Got {len(plaintext_bytes)} bytes.")
         
         if self.mode in ['ECB', 'CBC']:
             # Apply PKCS7 padding for block modes
-            block_size = AES.block_size
+            caller_padding = padding_length
+            block_size = BLOCK_SIZE
             padding_length = block_size - (len(plaintext_bytes) % block_size)
             if padding_length == block_size:
                 padding_length = 0  # No padding needed if already multiple of block size
@@ -280,6 +417,18 @@ class AES256WithSteps:
                               f"Padded data: {self._bytes_to_hex(padded_data)}\n"
                               f"Final length: {len(padded_data)} bytes\n"
                               f"Mode: {self.mode} - block cipher with PKCS7 padding")
+            elif caller_padding > 0:
+                padded_data = plaintext_bytes
+                original = plaintext_bytes[:-caller_padding]
+                self._log_step("3. Block Mode Processing with Padding",
+                              f"Input length: {len(original)} bytes\n"
+                              f"Block size: {block_size} bytes\n"
+                              f"Original data: {self._bytes_to_hex(original)}\n"
+                              f"Padding needed: {caller_padding} bytes (added by the caller)\n"
+                              f"Padding bytes: {self._bytes_to_hex(plaintext_bytes[-caller_padding:])}\n"
+                              f"Padded data: {self._bytes_to_hex(padded_data)}\n"
+                              f"Final length: {len(padded_data)} bytes\n"
+                              f"Mode: {self.mode} - block cipher with PKCS7 padding")
             else:
                 padded_data = plaintext_bytes
                 self._log_step("3. Block Mode Processing",
@@ -297,22 +446,21 @@ class AES256WithSteps:
                           f"Mode: {self.mode} is a stream cipher - processes exact input length")
         
         # Step 4: Mode-specific setup
+        cipher = self._new_cipher(self.iv)
+        
         if self.mode == 'ECB':
-            cipher = AES.new(self.key, AES.MODE_ECB)
             self._log_step("4. ECB Mode Setup",
                           f"Mode: Electronic Codebook (ECB)\n"
                           f"No IV required\n"
                           f"Each block encrypted independently\n"
                           f"⚠️ Less secure - identical blocks produce identical ciphertext")
         elif self.mode == 'CBC':
-            cipher = AES.new(self.key, AES.MODE_CBC, self.iv)
             self._log_step("4. CBC Mode Setup",
                           f"Mode: Cipher Block Chaining (CBC)\n"
                           f"IV: {self._bytes_to_hex(self.iv)}\n"
                           f"IV length: {len(self.iv)} bytes\n"
                           f"Each block XORed with previous ciphertext block")
         elif self.mode == 'CFB':
-            cipher = AES.new(self.key, AES.MODE_CFB, self.iv)
             self._log_step("4. CFB Mode Setup",
                           f"Mode: Cipher Feedback (CFB)\n"
                           f"IV: {self._bytes_to_hex(self.iv)}\n"
@@ -320,7 +468,6 @@ class AES256WithSteps:
                           f"Stream cipher mode - no padding required\n"
                           f"Plaintext XORed with encrypted IV/previous ciphertext")
         elif self.mode == 'OFB':
-            cipher = AES.new(self.key, AES.MODE_OFB, self.iv)
             self._log_step("4. OFB Mode Setup",
                           f"Mode: Output Feedback (OFB)\n"
                           f"IV: {self._bytes_to_hex(self.iv)}\n"
@@ -328,25 +475,47 @@ class AES256WithSteps:
                           f"Stream cipher mode - no padding required\n"
                           f"Plaintext XORed with encrypted keystream")
         elif self.mode == 'CTR':
-            cipher = AES.new(self.key, AES.MODE_CTR, nonce=self.iv)
             self._log_step("4. CTR Mode Setup",
                           f"Mode: Counter (CTR)\n"
                           f"Nonce: {self._bytes_to_hex(self.iv)}\n"
                           f"Nonce length: {len(self.iv)} bytes\n"
                           f"Stream cipher mode - no padding required\n"
                           f"Plaintext XORed with encrypted counter values")
+        elif self.mode == 'GCM':
+            self._log_step("4. GCM Mode Setup",
+                          f"Mode: Galois/Counter Mode (GCM)\n"
+                          f"Nonce: {self._bytes_to_hex(self.iv)}\n"
+                          f"Nonce length: {len(self.iv)} bytes\n"
+                          f"Associated data: {self._bytes_to_hex(self.aad) or '(none)'}\n"
+                          f"Authenticated encryption - CTR keystream plus GHASH tag\n"
+                          f"Counter blocks are independent, so blocks can be processed in parallel")
+        elif self.mode == 'EAX':
+            self._log_step("4. EAX Mode Setup",
+                          f"Mode: Encrypt-then-Authenticate-then-Translate (EAX)\n"
+                          f"Nonce: {self._bytes_to_hex(self.iv)}\n"
+                          f"Nonce length: {len(self.iv)} bytes\n"
+                          f"Associated data: {self._bytes_to_hex(self.aad) or '(none)'}\n"
+                          f"Authenticated encryption - CTR keystream plus OMAC tag")
+        elif self.mode == 'SIV':
+            self._log_step("4. SIV Mode Setup",
+                          f"Mode: Synthetic Initialization Vector (SIV)\n"
+                          f"Nonce: {self._bytes_to_hex(self.iv)}\n"
+                          f"Nonce length: {len(self.iv)} bytes\n"
+                          f"Associated data: {self._bytes_to_hex(self.aad) or '(none)'}\n"
+                          f"SIV key: 64 bytes derived from the 256-bit key with HKDF-SHA512\n"
+                          f"Nonce-misuse resistant authenticated encryption")
         else:
             # This should never happen due to validation in __init__, but added for safety
             raise ValueError(f"Unsupported mode: {self.mode}")
         
         # Step 5: Data processing info
         if self.mode in ['ECB', 'CBC']:
-            num_blocks = len(padded_data) // AES.block_size
+            num_blocks = len(padded_data) // BLOCK_SIZE
             self._log_step("5. Block Division",
                           f"Total data length: {len(padded_data)} bytes\n"
-                          f"Block size: {AES.block_size} bytes\n"
+                          f"Block size: {BLOCK_SIZE} bytes\n"
                           f"Number of blocks: {num_blocks}\n"
-                          f"Mode: {self.mode} processes data in {AES.block_size}-byte blocks")
+                          f"Mode: {self.mode} processes data in {BLOCK_SIZE}-byte blocks")
         else:
             self._log_step("5. Stream Processing",
                           f"Data length: {len(padded_data)} bytes\n"
@@ -366,24 +535,16 @@ class AES256WithSteps:
                           f"Length: {len(padded_data)} bytes")
         
         # Perform actual encryption
-        ciphertext = cipher.encrypt(padded_data)
+        if self.mode in ['GCM', 'EAX', 'SIV']:
+            # Authenticated modes encrypt and compute the tag in a single pass
+            ciphertext, tag = cipher.encrypt_and_digest(padded_data)
+        else:
+            ciphertext = cipher.encrypt(padded_data)
+            tag = b''
         
         # Log final encryption results
         if self.mode in ['ECB', 'CBC']:
-            num_blocks = len(padded_data) // AES.block_size
-            for i in range(num_blocks):
-                block_start = i * AES.block_size
-                block_end = block_start + AES.block_size
-                input_block = padded_data[block_start:block_end]
-                output_block = ciphertext[block_start:block_end]
-                
-                comparison = self._compare_blocks(input_block, output_block, "encryption")
-                self._log_step(f"6.{i+1}.19. Block {i+1} Final Result",
-                              f"📥 Original input: {self._bytes_to_hex(input_block)}\n"
-                              f"📤 Final ciphertext: {self._bytes_to_hex(output_block)}\n"
-                              f"📊 Input matrix:\n{self._format_state(input_block)}\n"
-                              f"📊 Output matrix:\n{self._format_state(output_block)}\n"
-                              f"{comparison}")
+            self._log_block_results(padded_data, ciphertext, is_encryption=True)
         else:
             # Stream cipher final result
             self._log_step("6.1. Stream Encryption Complete",
@@ -391,9 +552,15 @@ class AES256WithSteps:
                           f"Final ciphertext: {self._bytes_to_hex(ciphertext)}\n"
                           f"Stream encryption successful\n"
                           f"Length: {len(ciphertext)} bytes (same as input)")
+            if tag:
+                self._log_aead_authentication(len(ciphertext), "6.2")
         
         # Step 7: Final result
-        if self.mode in ['CBC', 'CFB', 'OFB', 'CTR']:
+        if self.mode in ['GCM', 'EAX', 'SIV']:
+            # Nonce + ciphertext + authentication tag
+            final_result = self.iv + ciphertext + tag
+            iv_label = "Nonce"
+        elif self.mode in ['CBC', 'CFB', 'OFB', 'CTR']:
             # Prepend IV/nonce to ciphertext for modes that need it
             final_result = self.iv + ciphertext
             iv_label = "Nonce" if self.mode == 'CTR' else "IV"
@@ -401,13 +568,22 @@ class AES256WithSteps:
             final_result = ciphertext
             iv_label = ""
             
-        result_b64 = base64.b64encode(final_result).decode('utf-8')
-        
         if self.mode == 'ECB':
             result_description = "Ciphertext only (no IV needed)"
+        elif tag:
+            result_description = f"{iv_label} + Ciphertext + Tag ({self._bytes_to_hex(tag)})"
         else:
             result_description = f"{iv_label} + Ciphertext"
         
+        if raw:
+            self._log_step("7. Final Output",
+                          f"Raw ciphertext: {self._bytes_to_hex(ciphertext)}\n"
+                          f"Final result: {result_description}\n"
+                          f"Combined data: {self._bytes_to_hex(final_result)}\n"
+                          f"Raw output: {len(final_result)} bytes")
+            return final_result
+        
+        result_b64 = base64.b64encode(final_result).decode('utf-8')
         self._log_step("7. Final Output",
                       f"Raw ciphertext: {self._bytes_to_hex(ciphertext)}\n"
                       f"Final result: {result_description}\n"
@@ -416,29 +592,38 @@ class AES256WithSteps:
         
         return result_b64
     
-    def decrypt(self, ciphertext_b64):
+    def decrypt(self, ciphertext_b64, raw=False):
         """
         Decrypt base64 encoded ciphertext
         
         Args:
             ciphertext_b64 (str): Base64 encoded ciphertext
+            raw (bool): Work on bytes: ciphertext_b64 may be the ciphertext bytes
+                from encrypt(raw=True), and the decrypted bytes are returned
+                instead of being decoded as UTF-8
             
         Returns:
-            str: Decrypted plaintext
+            str: Decrypted plaintext (bytes when raw is True)
         """
         self.steps = []  # Reset steps
         
         try:
             # Step 1: Decode base64
-            try:
-                ciphertext_data = base64.b64decode(ciphertext_b64)
-            except Exception as e:
-                raise ValueError(f"Invalid Base64 input: {str(e)}")
-                
-            self._log_step("1. Input Preparation",
-                          f"Base64 input: {ciphertext_b64}\n"
-                          f"Decoded bytes: {self._bytes_to_hex(ciphertext_data)}\n"
-                          f"Length: {len(ciphertext_data)} bytes")
+            if raw and isinstance(ciphertext_b64, bytes):
+                ciphertext_data = ciphertext_b64
+                self._log_step("1. Input Preparation",
+                              f"Raw input: {self._bytes_to_hex(ciphertext_data)}\n"
+                              f"Length: {len(ciphertext_data)} bytes")
+            else:
+                try:
+                    ciphertext_data = base64.b64decode(ciphertext_b64)
+                except Exception as e:
+                    raise ValueError(f"Invalid Base64 input: {str(e)}")
+                    
+                self._log_step("1. Input Preparation",
+                              f"Base64 input: {ciphertext_b64}\n"
+                              f"Decoded bytes: {self._bytes_to_hex(ciphertext_data)}\n"
+                              f"Length: {len(ciphertext_data)} bytes")
             
             # Validate minimum length
             if len(ciphertext_data) == 0:
@@ -453,6 +638,21 @@ class AES256WithSteps:
                               f"Ciphertext: {self._bytes_to_hex(ciphertext)}\n"
                               f"Length: {len(ciphertext)} bytes\n"
                               f"No IV required")
+            elif self.mode in ['GCM', 'EAX', 'SIV']:
+                # Authenticated modes carry nonce + ciphertext + 16-byte tag
+                # An empty message is still authenticated (16 bytes nonce + 16 bytes tag)
+                if len(ciphertext_data) < 32:
+                    raise ValueError(f"Invalid ciphertext length for {self.mode} mode: {len(ciphertext_data)} bytes (minimum 32 required)")
+                iv = ciphertext_data[:16]
+                ciphertext = ciphertext_data[16:-16]
+                tag = ciphertext_data[-16:]
+                self._log_step(f"2. {self.mode} Nonce and Tag Extraction",
+                              f"Mode: {self.mode}\n"
+                              f"Nonce: {self._bytes_to_hex(iv)}\n"
+                              f"Ciphertext: {self._bytes_to_hex(ciphertext)}\n"
+                              f"Tag: {self._bytes_to_hex(tag)}\n"
+                              f"Associated data: {self._bytes_to_hex(self.aad) or '(none)'}\n"
+                              f"Ciphertext length: {len(ciphertext)} bytes")
             else:
                 # All other modes require IV/nonce extraction
                 if len(ciphertext_data) < 17:  # At least 16 bytes IV + 1 byte data
@@ -468,39 +668,28 @@ class AES256WithSteps:
             
             # Validate block alignment (only for block modes)
             if self.mode in ['ECB', 'CBC']:
-                if len(ciphertext) % AES.block_size != 0:
-                    raise ValueError(f"Ciphertext length ({len(ciphertext)} bytes) is not aligned to block boundary ({AES.block_size} bytes)")
+                if len(ciphertext) % BLOCK_SIZE != 0:
+                    raise ValueError(f"Ciphertext length ({len(ciphertext)} bytes) is not aligned to block boundary ({BLOCK_SIZE} bytes)")
             
-            if len(ciphertext) == 0:
+            if len(ciphertext) == 0 and self.mode not in ['GCM', 'EAX', 'SIV']:
                 raise ValueError("No ciphertext data to decrypt")
             
             # Step 3: Key preparation
             self._log_step("3. Key Preparation",
                           f"Key: {self.key.decode('utf-8', errors='ignore')}\n"
                           f"Key bytes: {self._bytes_to_hex(self.key)}\n"
-                          f"Key length: {len(self.key)} bytes (256-bit)")
+                          f"Key length: {len(self.key)} bytes (256-bit)\n"
+                          f"Backend: {self.backend.name}")
             
             # Step 4: Cipher setup
-            if self.mode == 'ECB':
-                cipher = AES.new(self.key, AES.MODE_ECB)
-            elif self.mode == 'CBC':
-                cipher = AES.new(self.key, AES.MODE_CBC, iv)
-            elif self.mode == 'CFB':
-                cipher = AES.new(self.key, AES.MODE_CFB, iv)
-            elif self.mode == 'OFB':
-                cipher = AES.new(self.key, AES.MODE_OFB, iv)
-            elif self.mode == 'CTR':
-                cipher = AES.new(self.key, AES.MODE_CTR, nonce=iv)
-            else:
-                # This should never happen due to validation in __init__, but added for safety
-                raise ValueError(f"Unsupported mode: {self.mode}")
+            cipher = self._new_cipher(iv)
             
             # Step 5: Processing info based on mode
             if self.mode in ['ECB', 'CBC']:
-                num_blocks = len(ciphertext) // AES.block_size
+                num_blocks = len(ciphertext) // BLOCK_SIZE
                 self._log_step("4. Block Analysis",
                               f"Ciphertext length: {len(ciphertext)} bytes\n"
-                              f"Block size: {AES.block_size} bytes\n"
+                              f"Block size: {BLOCK_SIZE} bytes\n"
                               f"Number of blocks: {num_blocks}\n"
                               f"Mode: {self.mode} processes data in blocks")
                 
@@ -513,24 +702,20 @@ class AES256WithSteps:
                               f"No block division required")
             
             # Perform actual decryption
-            decrypted_data = cipher.decrypt(ciphertext)
+            if self.mode in ['GCM', 'EAX', 'SIV']:
+                # Tag is verified in the same pass; a mismatch raises before any plaintext is returned
+                decrypted_data = cipher.decrypt_and_verify(ciphertext, tag)
+                self._log_aead_authentication(len(ciphertext), "4.1")
+                self._log_step("4.2. Tag Verification",
+                              f"Received tag: {self._bytes_to_hex(tag)}\n"
+                              f"Ciphertext and associated data are authentic")
+            else:
+                decrypted_data = cipher.decrypt(ciphertext)
             
             # Log final decryption results
             if self.mode in ['ECB', 'CBC']:
-                num_blocks = len(ciphertext) // AES.block_size
-                for i in range(num_blocks):
-                    block_start = i * AES.block_size
-                    block_end = block_start + AES.block_size
-                    input_block = ciphertext[block_start:block_end]
-                    output_block = decrypted_data[block_start:block_end]
-                    
-                    comparison = self._compare_blocks(input_block, output_block, "decryption")
-                    self._log_step(f"5.{i+1}.19. Block {i+1} Decryption Result",
-                                  f"📥 Ciphertext input: {self._bytes_to_hex(input_block)}\n"
-                                  f"📤 Decrypted output: {self._bytes_to_hex(output_block)}\n"
-                                  f"📊 Input matrix:\n{self._format_state(input_block)}\n"
-                                  f"📊 Output matrix:\n{self._format_state(output_block)}\n"
-                                  f"{comparison}")
+                num_blocks = len(ciphertext) // BLOCK_SIZE
+                self._log_block_results(ciphertext, decrypted_data, is_encryption=False)
                 
                 self._log_step("6. All Blocks Decrypted",
                               f"Total decrypted data: {self._bytes_to_hex(decrypted_data)}\n"
@@ -550,7 +735,7 @@ class AES256WithSteps:
                     # Check if padding exists
                     if len(decrypted_data) > 0:
                         padding_length = decrypted_data[-1]
-                        if padding_length > 0 and padding_length <= AES.block_size:
+                        if padding_length > 0 and padding_length <= BLOCK_SIZE:
                             # Verify padding is valid PKCS7
                             padding_bytes = decrypted_data[-padding_length:]
                             if all(b == padding_length for b in padding_bytes):
@@ -592,6 +777,12 @@ class AES256WithSteps:
                               f"Final data: {self._bytes_to_hex(plaintext_bytes)}\n"
                               f"Length: {len(plaintext_bytes)} bytes")
             
+            if raw:
+                self._log_step(f"{'8' if self.mode in ['ECB', 'CBC'] else '7'}. Final Result",
+                              f"Raw output: {len(plaintext_bytes)} bytes\n"
+                              f"Decryption successful")
+                return plaintext_bytes
+            
             # Convert to string
             try:
                 plaintext = plaintext_bytes.decode('utf-8')
@@ -1,11 +1,77 @@
 # app.py
-from flask import Flask, render_template, request, jsonify, send_file
+from flask import Flask, render_template, request, jsonify, send_file, abort
 from aes_engine import AES256WithSteps
-from xmind_exporter import export_to_xmind
+from key_derivation import PassphraseAES256, decode_header
+from step_codec import encode_steps
+import base64
+import binascii
+import gzip
 import os
+import re
 
 app = Flask(__name__)
 
+# shared_cache.FileCache for results and XMind files; set by prefork_server.py.
+# Without it the app keeps a single static/aes_steps.xmind as before.
+app.config['SHARED_CACHE'] = None
+
+# Responses smaller than this are sent uncompressed
+COMPRESS_MIN_SIZE = 1024
+
+XMIND_PATH = 'static/aes_steps.xmind'
+ARTIFACT_ID = re.compile(r'[0-9a-f]{64}')
+
+# Largest input (bytes) the slow reference backends get, so one request stays
+# well under a second. The bit-sliced backend pays ~10 ms per sequential block
+# (CBC encryption, OFB) or per byte (CFB-8).
+BACKEND_INPUT_LIMITS = {'ttable': 16 * 1024, 'bitslice': 512}
+BACKEND_MODE_INPUT_LIMITS = {('bitslice', 'CFB'): 32}
+
+def data_size(action, text, key_type, mode):
+    """
+    Bytes of message data a request asks the cipher to process
+
+    For decryption this is the ciphertext body: the KDF header and IV/nonce
+    are dropped, and a block-mode body counts one block less, since it holds
+    at least one byte of padding. So ciphertext produced from input at a
+    limit is accepted again at that limit.
+    """
+    data = text.encode('utf-8')
+    if action == 'encrypt':
+        return len(data)
+    try:
+        data = base64.b64decode(data, validate=True)
+    except (binascii.Error, ValueError):
+        return 0  # Not Base64; the engine reports the error
+    if key_type != 'raw':
+        data = decode_header(data)[3]
+    size = len(data) if mode == 'ECB' else len(data) - 16
+    if mode in ['ECB', 'CBC']:
+        size -= 16
+    return max(size, 0)
+
+def compress_response(response):
+    """Encode a JSON response with brotli or gzip when the client accepts it"""
+    response.vary.add('Accept-Encoding')
+    if response.content_length is None or response.content_length < COMPRESS_MIN_SIZE:
+        return response
+
+    data = response.get_data()
+    encoding = request.accept_encodings.best_match(['br', 'gzip'])
+    if encoding == 'br':
+        try:
+            import brotli
+            data = brotli.compress(data, quality=5)
+        except ImportError:
+            # brotli is optional; fall back to gzip when it is not installed
+            encoding = request.accept_encodings.best_match(['gzip'])
+    if encoding == 'gzip':
+        data = gzip.compress(data, compresslevel=6)
+    if encoding:
+        response.set_data(data)
+        response.headers['Content-Encoding'] = encoding
+    return response
+
 @app.route('/')
 def index():
     return render_template('index.html')
@@ -18,10 +84,23 @@ def process():
         key = request.form['key']
         mode = request.form['mode']
         iv = request.form.get('iv')
+        aad = request.form.get('aad')
+        key_type = request.form.get('key_type', 'raw')
+        trace_format = request.form.get('trace_format', 'full')
+        backend = request.form.get('backend', 'pycryptodome')
 
         # Validate inputs
-        if len(key) != 32:
+        if key_type not in ['raw', 'pbkdf2', 'scrypt']:
+            return jsonify({"error": "Key type must be one of: raw, pbkdf2, scrypt."})
+
+        if trace_format not in ['full', 'compact']:
+            return jsonify({"error": "Trace format must be one of: full, compact."})
+
+        if key_type == 'raw' and len(key) != 32:
             return jsonify({"error": "Key must be 32 characters (256-bit)."})
+
+        if key_type != 'raw' and not key:
+            return jsonify({"error": "Passphrase cannot be empty."})
         
         if not plaintext.strip():
             return jsonify({"error": "Text input cannot be empty."})
@@ -38,12 +117,41 @@ def process():
                 "error_ar": error_ar
             })
         
-        if mode in ['CBC', 'CFB', 'OFB', 'CTR'] and iv and len(iv) != 16:
-            iv_label = "Nonce" if mode == 'CTR' else "IV"
+        limit = BACKEND_MODE_INPUT_LIMITS.get((backend, mode), BACKEND_INPUT_LIMITS.get(backend))
+        if limit is not None:
+            size = data_size(action, plaintext, key_type, mode)
+            if size > limit:
+                return jsonify({"error": f"The {backend} backend accepts at most {limit} bytes in {mode} mode "
+                                         f"(got {size}); use pycryptodome for larger inputs."})
+
+        if mode in ['CBC', 'CFB', 'OFB', 'CTR', 'GCM', 'EAX', 'SIV'] and iv and len(iv) != 16:
+            iv_label = "Nonce" if mode in ['CTR', 'GCM', 'EAX', 'SIV'] else "IV"
             return jsonify({"error": f"{iv_label} must be 16 characters for {mode} mode."})
 
-        # Create AES instance
-        aes = AES256WithSteps(key.encode(), mode, iv.encode() if iv else None)
+        # Associated data is ignored for modes that cannot authenticate it
+        if mode not in ['GCM', 'EAX', 'SIV']:
+            aad = None
+
+        # Only deterministic encryptions are cached: raw keys with a fixed IV (or ECB).
+        # Random IVs and passphrase salts make every other encryption unique, and
+        # decryption results are never kept since they hold recovered plaintext.
+        cache = app.config['SHARED_CACHE']
+        cache_key = None
+        if cache is not None and key_type == 'raw' and action == 'encrypt' and (mode == 'ECB' or iv):
+            cache_key = cache.key_for(action, plaintext, key, mode, iv or '', aad or '', backend, trace_format)
+            body = cache.get(cache_key)
+            # The XMind file is evicted separately, so a hit needs both
+            if body is not None and os.path.exists(cache.path(cache_key, '.xmind')):
+                request.environ['aes.cache_hit'] = True
+                return compress_response(app.response_class(body, mimetype='application/json'))
+
+        # Create AES instance; passphrases go through the key derivation layer
+        if key_type == 'raw':
+            aes = AES256WithSteps(key.encode(), mode, iv.encode() if iv else None,
+                                  aad.encode() if aad else None, backend=backend)
+        else:
+            aes = PassphraseAES256(key, mode, iv.encode() if iv else None,
+                                   aad.encode() if aad else None, kdf=key_type, backend=backend)
 
         # Perform encryption or decryption
         if action == 'encrypt':
@@ -53,11 +161,33 @@ def process():
 
         steps = aes.get_steps()
 
-        # Save steps to Xmind
-        xmind_path = 'static/aes_steps.xmind'
-        export_to_xmind(steps, xmind_path)
+        # Save steps to Xmind (the exporter pulls in the xmind package, so load it on first use)
+        from xmind_exporter import export_to_xmind
+        if cache is None:
+            export_to_xmind(steps, XMIND_PATH)
+            download = '/download'
+        else:
+            # Every result gets its own file, so concurrent workers never overwrite each other's
+            artifact = cache_key or os.urandom(32).hex()
+            temp_path = cache.temp_path(artifact, '.xmind')
+            export_to_xmind(steps, temp_path)
+            if os.path.exists(temp_path):
+                cache.commit(temp_path, artifact, '.xmind')
+                download = f'/download?id={artifact}'
+            else:
+                # The exporter fell back to a text file; there is nothing to download
+                download = None
+                cache_key = None
 
-        return jsonify({"result": result, "steps": steps})
+        # The compact format sends repeated explanation text once (see step_codec.py)
+        if trace_format == 'compact':
+            payload = {"result": result, "trace": encode_steps(steps), "download": download}
+        else:
+            payload = {"result": result, "steps": steps, "download": download}
+        response = jsonify(payload)
+        if cache_key is not None:
+            cache.put(cache_key, response.get_data())
+        return compress_response(response)
         
     except ValueError as e:
         return jsonify({"error": str(e)})
@@ -66,7 +196,18 @@ def process():
 
 @app.route('/download')
 def download():
-    return send_file('static/aes_steps.xmind', as_attachment=True)
+    artifact = request.args.get('id')
+    if artifact is None:
+        return send_file(XMIND_PATH, as_attachment=True)
+
+    cache = app.config['SHARED_CACHE']
+    if cache is None or not ARTIFACT_ID.fullmatch(artifact):
+        abort(404)
+    path = cache.path(artifact, '.xmind')
+    if not os.path.exists(path):
+        abort(404)
+    cache.touch(path)
+    return send_file(path, as_attachment=True, download_name='aes_steps.xmind')
 
 if __name__ == '__main__':
     app.run(debug=True)
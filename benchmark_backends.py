@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Throughput comparison of the block cipher backends
+
+Every backend is first cross-checked against the FIPS-197 vector and against
+pycryptodome in each reference mode (the script fails on any mismatch), then
+each backend × mode pair encrypts a buffer with tracing disabled and the best
+of several runs is reported in MB/s.
+
+    python benchmark_backends.py                       # all backends, 1 MB
+    python benchmark_backends.py --size 256K --runs 5 --backends ttable bitslice
+"""
+
+import argparse
+import sys
+import time
+
+from aes_backends import BACKENDS, REFERENCE_MODES, get_backend, verify_backends
+from aes_cli import parse_size
+from aes_engine import AES256WithSteps
+
+KEY = bytes(range(32))
+IV = bytes(range(16))
+
+# Largest buffer per (backend, mode) so the slow reference paths finish quickly.
+# The pure-Python T-table backend is slow everywhere; the bit-sliced backend
+# only pays off in modes whose blocks are independent (ECB, CTR, CBC decryption)
+# and runs CBC encryption, OFB and CFB-8 one block at a time.
+SIZE_LIMITS = {
+    ('ttable', 'CFB'): 16 * 1024,
+    ('bitslice', 'CBC'): 1024,
+    ('bitslice', 'OFB'): 1024,
+    ('bitslice', 'CFB'): 64,
+}
+BACKEND_SIZE_LIMITS = {'ttable': 256 * 1024}
+
+
+def measure(backend, mode, data, runs):
+    """
+    Encrypt data through AES256WithSteps with tracing off
+
+    Returns:
+        float: Best throughput in MB/s
+    """
+    best = None
+    for _ in range(runs):
+        aes = AES256WithSteps(KEY, mode, IV, trace=False, backend=backend)
+        start = time.perf_counter()
+        aes.encrypt(data)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return len(data) / best / 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare block cipher backend throughput.")
+    parser.add_argument('--backends', nargs='+', choices=list(BACKENDS), default=list(BACKENDS))
+    parser.add_argument('--modes', nargs='+', type=str.upper, default=list(BACKENDS['pycryptodome'].modes),
+                        help="Modes to measure (default: all); reference backends skip AEAD modes")
+    parser.add_argument('--size', type=parse_size, default=1024 * 1024,
+                        help="Bytes encrypted per run, accepts K/M/G suffixes (default: 1M)")
+    parser.add_argument('--runs', type=int, default=3, help="Runs per measurement (default: 3)")
+    args = parser.parse_args(argv)
+
+    available = []
+    for name in args.backends:
+        try:
+            get_backend(name)
+            available.append(name)
+        except ValueError as e:
+            print(f"{name}: skipped ({e})")
+
+    problems = verify_backends(available, modes=[mode for mode in args.modes if mode in REFERENCE_MODES])
+    if problems:
+        for problem in problems:
+            print(f"FAIL: {problem}")
+        return 1
+    print(f"Cross-check passed for: {', '.join(available)}\n")
+
+    print(f"{'backend':<16}{'mode':<8}{'bytes':>10}{'MB/s':>12}")
+    print("-" * 46)
+    for name in available:
+        backend = get_backend(name)
+        for mode in args.modes:
+            if mode not in backend.modes:
+                continue
+            size = min(args.size, SIZE_LIMITS.get((name, mode), BACKEND_SIZE_LIMITS.get(name, args.size)))
+            data = bytes(i & 0xFF for i in range(size))
+            print(f"{name:<16}{mode:<8}{size:>10}{measure(name, mode, data, args.runs):>12.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
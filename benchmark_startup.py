@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Import-time benchmark for the engine, CLI and web app
+
+Each entry point is imported in a fresh interpreter (so no module is preloaded)
+and the cumulative import time reported by `python -X importtime` is
+collected. The script fails if an entry point cannot be imported, loads
+modules that should be deferred until first use, or exceeds an optional time
+budget. Only an entry point whose optional dependency (flask, xmind) is not
+installed is skipped. test_startup.py runs the deferred-import check under
+pytest; the time budget is only enforced here, since it depends on the machine.
+
+    python benchmark_startup.py                 # report, check deferred imports
+    python benchmark_startup.py --runs 10 --max-ms 250
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+# Modules each entry point must not import at load time
+DEFERRED_IMPORTS = {
+    'aes_engine': ['Crypto', 'xmind', 'flask'],
+    'aes_cli': ['Crypto', 'xmind', 'flask'],
+    'app': ['Crypto', 'xmind', 'xmind_exporter'],
+}
+
+FIRST_REQUEST_SCRIPT = "import app; app.app.test_client().get('/')"
+
+# Packages whose absence skips a measurement instead of failing it
+OPTIONAL_DEPENDENCIES = ['flask', 'xmind']
+MISSING_MODULE = re.compile(r"ModuleNotFoundError: No module named '([\w.]+)'")
+
+
+def _run_python(args):
+    # Allow .pyc caching so runs after the first measure importing, not compiling
+    env = {name: value for name, value in os.environ.items() if name != 'PYTHONDONTWRITEBYTECODE'}
+    return subprocess.run([sys.executable] + args, capture_output=True, text=True,
+                          cwd=os.path.dirname(os.path.abspath(__file__)), env=env)
+
+
+def _missing_optional_dependency(error):
+    """Name of the optional package whose absence caused error, or None"""
+    match = MISSING_MODULE.search(str(error).strip().splitlines()[-1])
+    if match and match.group(1).split('.')[0] in OPTIONAL_DEPENDENCIES:
+        return match.group(1).split('.')[0]
+    return None
+
+
+def measure_import(module):
+    """
+    Import module in a fresh interpreter
+
+    Returns:
+        tuple: (cumulative import time in ms, set of top-level packages loaded)
+    """
+    proc = _run_python(['-X', 'importtime', '-c', f'import {module}'])
+    if proc.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{proc.stderr}")
+
+    total_us = 0
+    loaded = set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        parts = [part.strip() for part in line[len('import time:'):].split('|')]
+        if len(parts) != 3 or not parts[1].isdigit():
+            continue
+        name = parts[2]
+        loaded.add(name.split('.')[0])
+        if name == module:
+            total_us = int(parts[1])
+    return total_us / 1000, loaded
+
+
+def measure_first_request():
+    """Wall-clock time from interpreter start to the first served request, in ms"""
+    start = time.perf_counter()
+    proc = _run_python(['-c', FIRST_REQUEST_SCRIPT])
+    elapsed = (time.perf_counter() - start) * 1000
+    if proc.returncode != 0:
+        raise RuntimeError(f"First request failed:\n{proc.stderr}")
+    return elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure cold-start import time.")
+    parser.add_argument('--runs', type=int, default=5, help="Fresh interpreters per measurement (default: 5)")
+    parser.add_argument('--max-ms', type=float, help="Fail if any median import time exceeds this budget")
+    args = parser.parse_args(argv)
+
+    failures = []
+    print(f"{'entry point':<24}{'median ms':>12}{'min ms':>10}")
+    print("-" * 46)
+
+    for module, forbidden in DEFERRED_IMPORTS.items():
+        try:
+            samples = []
+            loaded = set()
+            for _ in range(args.runs):
+                elapsed, loaded = measure_import(module)
+                samples.append(elapsed)
+        except RuntimeError as e:
+            # Missing optional dependencies (e.g. flask) should not hide the other results
+            missing = _missing_optional_dependency(e)
+            print(f"{module:<24}{'skipped' if missing else 'error':>12}")
+            print(f"  {str(e).strip().splitlines()[-1]}")
+            if not missing:
+                failures.append(f"importing {module} failed")
+            continue
+
+        median = statistics.median(samples)
+        print(f"{'import ' + module:<24}{median:>12.1f}{min(samples):>10.1f}")
+        eager = sorted(name for name in forbidden if name in loaded)
+        if eager:
+            failures.append(f"{module} imports {', '.join(eager)} at load time")
+        if args.max_ms is not None and median > args.max_ms:
+            failures.append(f"{module} import took {median:.1f} ms (budget {args.max_ms:.1f} ms)")
+
+    try:
+        samples = [measure_first_request() for _ in range(args.runs)]
+        print(f"{'app first request':<24}{statistics.median(samples):>12.1f}{min(samples):>10.1f}")
+    except RuntimeError as e:
+        missing = _missing_optional_dependency(e)
+        print(f"{'app first request':<24}{'skipped' if missing else 'error':>12}")
+        print(f"  {str(e).strip().splitlines()[-1]}")
+        if not missing:
+            failures.append("app first request failed")
+
+    if failures:
+        print()
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,285 @@
+# key_derivation.py
+# Passphrase support in front of AES256WithSteps: derives the 256-bit key
+# with PBKDF2 or scrypt and stores the KDF parameters in the ciphertext.
+import base64
+import binascii
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from aes_engine import AES256WithSteps
+from shared_cache import keyed_digest
+
+SALT_SIZE = 16
+KEY_SIZE = 32
+
+# KDF identifiers written into the ciphertext header
+KDF_IDS = {'PBKDF2': 1, 'SCRYPT': 2}
+KDF_NAMES = {kdf_id: name for name, kdf_id in KDF_IDS.items()}
+
+DEFAULT_PARAMS = {
+    'PBKDF2': {'iterations': 200000},
+    'SCRYPT': {'n': 2 ** 15, 'r': 8, 'p': 1},
+}
+
+# Ceilings on the work a ciphertext header can ask for. Decryption takes the
+# parameters from untrusted input, so they are capped at a few times the
+# defaults: ~1M PBKDF2 rounds (well under a second) and 64 MiB of scrypt
+# memory (128 * N * r bytes) with at most 4 lanes.
+MAX_PBKDF2_ITERATIONS = 1000000
+MAX_SCRYPT_MEMORY = 64 * 1024 * 1024
+MAX_SCRYPT_PARALLELISM = 4
+
+
+def _validate_params(kdf, params):
+    """Return a complete, validated parameter dict for kdf"""
+    if kdf not in KDF_IDS:
+        raise ValueError(f"KDF must be one of: {', '.join(KDF_IDS)}")
+    merged = dict(DEFAULT_PARAMS[kdf], **(params or {}))
+    if kdf == 'PBKDF2':
+        if not 1000 <= merged['iterations'] <= MAX_PBKDF2_ITERATIONS:
+            raise ValueError(f"PBKDF2 iterations must be between 1000 and {MAX_PBKDF2_ITERATIONS:,}")
+    else:
+        n = merged['n']
+        if n < 2 or n & (n - 1):
+            raise ValueError("scrypt N must be a power of two of at least 2")
+        if not 1 <= merged['r'] <= 255:
+            raise ValueError("scrypt r must be between 1 and 255")
+        if not 1 <= merged['p'] <= MAX_SCRYPT_PARALLELISM:
+            raise ValueError(f"scrypt p must be between 1 and {MAX_SCRYPT_PARALLELISM}")
+        if 128 * n * merged['r'] > MAX_SCRYPT_MEMORY:
+            raise ValueError(f"scrypt memory (128 * N * r) must not exceed {MAX_SCRYPT_MEMORY // 2 ** 20} MiB")
+    return merged
+
+
+def encode_header(kdf, params, salt):
+    """
+    Serialize the KDF settings that precede the engine output
+
+    Layout: KDF id (1 byte), parameters, salt length (1 byte), salt
+        PBKDF2 parameters: iterations (4 bytes, big-endian)
+        scrypt parameters: log2(N), r, p (1 byte each)
+    """
+    if kdf == 'PBKDF2':
+        encoded_params = params['iterations'].to_bytes(4, 'big')
+    else:
+        encoded_params = bytes([params['n'].bit_length() - 1, params['r'], params['p']])
+    return bytes([KDF_IDS[kdf]]) + encoded_params + bytes([len(salt)]) + salt
+
+
+def decode_header(data):
+    """
+    Parse a header written by encode_header
+
+    The parameters are checked against the MAX_* ceilings here, before any
+    key is derived, so a crafted header cannot demand an expensive derivation.
+
+    Returns:
+        tuple: (kdf, params, salt, remaining data)
+    """
+    if not data:
+        raise ValueError("Missing key derivation header")
+    kdf = KDF_NAMES.get(data[0])
+    if kdf is None:
+        raise ValueError(f"Unknown key derivation function id: {data[0]}")
+    offset = 1
+    if kdf == 'PBKDF2':
+        if len(data) < offset + 4:
+            raise ValueError("Truncated key derivation header")
+        params = {'iterations': int.from_bytes(data[offset:offset + 4], 'big')}
+        offset += 4
+    else:
+        if len(data) < offset + 3:
+            raise ValueError("Truncated key derivation header")
+        params = {'n': 1 << data[offset], 'r': data[offset + 1], 'p': data[offset + 2]}
+        offset += 3
+    if len(data) < offset + 1 or len(data) < offset + 1 + data[offset]:
+        raise ValueError("Truncated key derivation header")
+    salt_length = data[offset]
+    salt = data[offset + 1:offset + 1 + salt_length]
+    return kdf, _validate_params(kdf, params), salt, data[offset + 1 + salt_length:]
+
+
+class DerivedKeyCache:
+    """
+    Bounded, memory-only LRU cache of derived keys.
+
+    Entries are looked up by HMAC-SHA256(secret, passphrase || salt || params)
+    with a per-process random secret, so the cache never holds passphrases
+    and its lookup keys are useless outside this process.
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._secret = os.urandom(32)
+        self._keys = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _lookup_key(self, passphrase, kdf, params, salt):
+        return keyed_digest(self._secret, passphrase, kdf, repr(sorted(params.items())), salt)
+
+    def get(self, passphrase, kdf, params, salt):
+        lookup = self._lookup_key(passphrase, kdf, params, salt)
+        with self._lock:
+            key = self._keys.get(lookup)
+            if key is None:
+                self.misses += 1
+                return None
+            self._keys.move_to_end(lookup)
+            self.hits += 1
+            return key
+
+    def put(self, passphrase, kdf, params, salt, key):
+        lookup = self._lookup_key(passphrase, kdf, params, salt)
+        with self._lock:
+            self._keys[lookup] = key
+            self._keys.move_to_end(lookup)
+            while len(self._keys) > self.max_entries:
+                self._keys.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._keys.clear()
+
+
+default_cache = DerivedKeyCache()
+
+
+def derive_key(passphrase, salt, kdf='PBKDF2', params=None, cache=default_cache):
+    """
+    Derive a 32-byte AES-256 key from a passphrase
+
+    Args:
+        passphrase (bytes): Passphrase to stretch
+        salt (bytes): Random salt stored alongside the ciphertext
+        kdf (str): 'PBKDF2' (HMAC-SHA256) or 'SCRYPT'
+        params (dict): KDF parameters, defaults from DEFAULT_PARAMS
+        cache (DerivedKeyCache): Cache to consult, or None to always derive
+
+    Returns:
+        tuple: (key, derivation info dict for tracing)
+    """
+    kdf = kdf.upper()
+    params = _validate_params(kdf, params)
+    start = time.perf_counter()
+
+    key = cache.get(passphrase, kdf, params, salt) if cache is not None else None
+    cached = key is not None
+    if not cached:
+        if kdf == 'PBKDF2':
+            from Crypto.Hash import SHA256
+            from Crypto.Protocol.KDF import PBKDF2
+
+            key = PBKDF2(passphrase, salt, KEY_SIZE, count=params['iterations'], hmac_hash_module=SHA256)
+        else:
+            from Crypto.Protocol.KDF import scrypt
+
+            key = scrypt(passphrase, salt, KEY_SIZE, N=params['n'], r=params['r'], p=params['p'])
+        if cache is not None:
+            cache.put(passphrase, kdf, params, salt, key)
+
+    return key, {
+        "kdf": kdf,
+        "params": params,
+        "salt": salt,
+        "cached": cached,
+        "elapsed_ms": (time.perf_counter() - start) * 1000,
+    }
+
+
+class PassphraseAES256:
+    """
+    AES256WithSteps keyed by a passphrase instead of a raw 32-byte key.
+
+    Output is Base64(KDF header + engine output), so decryption recovers the
+    salt and parameters from the ciphertext itself.
+    """
+
+    def __init__(self, passphrase, mode='ECB', iv=None, aad=None, trace=True,
+                 kdf='PBKDF2', params=None, cache=default_cache, backend='pycryptodome'):
+        """
+        Args:
+            passphrase (str or bytes): Passphrase of any length
+            mode, iv, aad, trace, backend: As for AES256WithSteps
+            kdf (str): 'PBKDF2' or 'SCRYPT' (used for encryption; decryption reads the header)
+            params (dict): KDF parameters, defaults from DEFAULT_PARAMS
+            cache (DerivedKeyCache): Derived-key cache, None to disable
+        """
+        if isinstance(passphrase, str):
+            passphrase = passphrase.encode('utf-8')
+        if not passphrase:
+            raise ValueError("Passphrase cannot be empty")
+        self.passphrase = passphrase
+        self.mode = mode
+        self.iv = iv
+        self.aad = aad
+        self.trace = trace
+        self.kdf = kdf.upper()
+        self.params = _validate_params(self.kdf, params)
+        self.cache = cache
+        self.backend = backend
+        self.steps = []
+
+    def _engine(self, kdf, params, salt):
+        key, info = derive_key(self.passphrase, salt, kdf, params, self.cache)
+        aes = AES256WithSteps(key, self.mode, self.iv, self.aad, self.trace, self.backend)
+        return aes, info
+
+    def _derivation_step(self, info):
+        if info["kdf"] == 'PBKDF2':
+            algorithm = "PBKDF2-HMAC-SHA256"
+            settings = f"Iterations: {info['params']['iterations']}"
+        else:
+            algorithm = "scrypt"
+            settings = f"N: {info['params']['n']}, r: {info['params']['r']}, p: {info['params']['p']}"
+        cache_status = "hit (derivation skipped)" if info["cached"] else "miss (key derived)"
+        return {
+            "step": "0. Key Derivation",
+            "detail": (f"Algorithm: {algorithm}\n"
+                       f"{settings}\n"
+                       f"Salt: {binascii.hexlify(info['salt']).decode('utf-8').upper()}\n"
+                       f"Derived key length: {KEY_SIZE} bytes (256-bit)\n"
+                       f"Cache: {cache_status}\n"
+                       f"Derivation time: {info['elapsed_ms']:.1f} ms"),
+        }
+
+    def encrypt(self, plaintext):
+        """
+        Encrypt plaintext with a key derived from the passphrase
+
+        Returns:
+            str: Base64 encoded KDF header + engine output
+        """
+        # A fresh salt per message, so equal passphrases never show in the headers;
+        # the derived key is cached, so decrypting this output skips the KDF
+        salt = os.urandom(SALT_SIZE)
+        aes, info = self._engine(self.kdf, self.params, salt)
+        payload = aes.encrypt(plaintext, raw=True)
+        result = base64.b64encode(encode_header(self.kdf, self.params, salt) + payload).decode('utf-8')
+        self.steps = [self._derivation_step(info)] + aes.get_steps() if self.trace else []
+        return result
+
+    def decrypt(self, ciphertext_b64, raw=False):
+        """
+        Decrypt data produced by encrypt(); KDF settings come from its header
+
+        Returns:
+            str: Decrypted plaintext (bytes when raw is True)
+        """
+        try:
+            data = base64.b64decode(ciphertext_b64)
+        except Exception as e:
+            raise ValueError(f"Invalid Base64 input: {str(e)}")
+        kdf, params, salt, payload = decode_header(data)
+        aes, info = self._engine(kdf, params, salt)
+        try:
+            return aes.decrypt(base64.b64encode(payload).decode('utf-8'), raw=raw)
+        finally:
+            self.steps = [self._derivation_step(info)] + aes.get_steps() if self.trace else []
+
+    def get_steps(self):
+        """Return the logged steps, key derivation first"""
+        return self.steps
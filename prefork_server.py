@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+"""
+Pre-fork multi-process server for app.py (POSIX only)
+
+The parent process imports the app, warms the engine, cipher backends, XMind
+exporter and templates, freezes the garbage collector and only then forks the
+workers. Module-level tables (round text, S-boxes, T-tables) therefore stay in
+copy-on-write pages shared by every worker, so each additional worker adds only
+the memory its own requests allocate.
+
+All workers accept from one listening socket and share:
+    - a bounded result/XMind cache (shared_cache.FileCache, on /dev/shm when present)
+    - a shared-memory table of per-worker statistics, served at /stats
+
+The parent restarts workers that exit, stop sending heartbeats or spend longer
+than --timeout on one request.
+
+    python prefork_server.py --workers 4 --port 8000
+    curl http://127.0.0.1:8000/stats
+"""
+
+import argparse
+import gc
+import mmap
+import os
+import signal
+import socket
+import struct
+import sys
+import time
+
+# Per-worker slot in the shared statistics table. The parent writes the first
+# part and the worker the second, so each field has a single writer.
+PARENT_FIELDS = struct.Struct('<Q')  # restarts
+WORKER_FIELDS = struct.Struct('<qdddQQQdQQQ')
+# pid, started, heartbeat, busy_since, requests, errors, cache_hits,
+# busy_seconds, bytes_sent, rss_bytes, private_bytes
+SLOT_SIZE = PARENT_FIELDS.size + WORKER_FIELDS.size
+
+HEARTBEAT_INTERVAL = 0.5
+MEMORY_SAMPLE_INTERVAL = 2.0
+
+
+def _memory_usage():
+    """
+    Resident and private (not shared with other processes) memory in bytes
+
+    Uses /proc/self/smaps_rollup on Linux; elsewhere only the peak RSS is known.
+    """
+    try:
+        values = {}
+        with open('/proc/self/smaps_rollup') as f:
+            for line in f:
+                name, _, rest = line.partition(':')
+                if rest.strip().endswith('kB'):
+                    values[name] = int(rest.split()[0]) * 1024
+        return values['Rss'], values['Private_Clean'] + values['Private_Dirty']
+    except (OSError, KeyError, ValueError):
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        peak *= 1 if sys.platform == 'darwin' else 1024
+        return peak, 0
+
+
+class StatsTable:
+    """Fixed-size table of worker statistics in anonymous shared memory"""
+
+    def __init__(self, workers):
+        self.workers = workers
+        # An anonymous MAP_SHARED mapping created before fork is shared by all children
+        self.memory = mmap.mmap(-1, SLOT_SIZE * workers)
+
+    def reset(self, index, restarts):
+        offset = index * SLOT_SIZE
+        PARENT_FIELDS.pack_into(self.memory, offset, restarts)
+        WORKER_FIELDS.pack_into(self.memory, offset + PARENT_FIELDS.size, 0, time.time(), time.time(),
+                                0, 0, 0, 0, 0, 0, 0, 0)
+
+    def restarts(self, index):
+        return PARENT_FIELDS.unpack_from(self.memory, index * SLOT_SIZE)[0]
+
+    def write(self, index, values):
+        WORKER_FIELDS.pack_into(self.memory, index * SLOT_SIZE + PARENT_FIELDS.size, *values)
+
+    def read(self, index):
+        offset = index * SLOT_SIZE
+        (pid, started, heartbeat, busy_since, requests, errors, cache_hits,
+         busy_seconds, bytes_sent, rss, private) = WORKER_FIELDS.unpack_from(self.memory, offset + PARENT_FIELDS.size)
+        return {
+            "pid": pid, "started": started, "heartbeat": heartbeat, "busy_since": busy_since,
+            "requests": requests, "errors": errors, "cache_hits": cache_hits,
+            "busy_seconds": busy_seconds, "bytes_sent": bytes_sent,
+            "rss_bytes": rss, "private_bytes": private, "restarts": self.restarts(index),
+        }
+
+    def healthy(self, slot, timeout, now=None):
+        """A worker is healthy if it is idle with a recent heartbeat, or busy for less than timeout"""
+        now = time.time() if now is None else now
+        if not slot["pid"]:
+            return False
+        if slot["busy_since"]:
+            return now - slot["busy_since"] < timeout
+        return now - slot["heartbeat"] < timeout
+
+    def report(self, timeout):
+        """Per-worker health and throughput, plus totals"""
+        now = time.time()
+        workers = []
+        for index in range(self.workers):
+            slot = self.read(index)
+            uptime = max(now - slot["started"], 1e-9)
+            workers.append({
+                "worker": index,
+                "pid": slot["pid"],
+                "healthy": self.healthy(slot, timeout, now),
+                "busy": bool(slot["busy_since"]),
+                "uptime_seconds": round(uptime, 1),
+                "restarts": slot["restarts"],
+                "requests": slot["requests"],
+                "errors": slot["errors"],
+                "cache_hits": slot["cache_hits"],
+                "requests_per_second": round(slot["requests"] / uptime, 3),
+                "average_ms": round(slot["busy_seconds"] * 1000 / slot["requests"], 2) if slot["requests"] else 0,
+                "bytes_sent": slot["bytes_sent"],
+                "rss_mb": round(slot["rss_bytes"] / 2 ** 20, 1),
+                "private_mb": round(slot["private_bytes"] / 2 ** 20, 1),
+            })
+        totals = {name: sum(worker[name] for worker in workers)
+                  for name in ["requests", "errors", "cache_hits", "bytes_sent", "restarts"]}
+        totals["healthy_workers"] = sum(worker["healthy"] for worker in workers)
+        return {"workers": workers, "totals": totals}
+
+
+class WorkerState:
+    """Counters of the current worker process, published to its StatsTable slot"""
+
+    def __init__(self, table, index):
+        self.table = table
+        self.index = index
+        self.pid = os.getpid()
+        self.started = time.time()
+        self.busy_since = 0.0
+        self.requests = 0
+        self.errors = 0
+        self.cache_hits = 0
+        self.busy_seconds = 0.0
+        self.bytes_sent = 0
+        self.rss = 0
+        self.private = 0
+        self.memory_sampled = 0.0
+        self.publish()
+
+    def publish(self):
+        now = time.time()
+        if now - self.memory_sampled >= MEMORY_SAMPLE_INTERVAL:
+            self.rss, self.private = _memory_usage()
+            self.memory_sampled = now
+        self.table.write(self.index, (self.pid, self.started, now, self.busy_since, self.requests,
+                                      self.errors, self.cache_hits, self.busy_seconds, self.bytes_sent,
+                                      self.rss, self.private))
+
+
+class StatsMiddleware:
+    """WSGI middleware counting requests, errors, cache hits, busy time and bytes for one worker"""
+
+    def __init__(self, wsgi_app, state):
+        self.wsgi_app = wsgi_app
+        self.state = state
+
+    def __call__(self, environ, start_response):
+        state = self.state
+        state.busy_since = time.time()
+        state.publish()
+        status = []
+
+        def recording_start_response(status_line, headers, exc_info=None):
+            status.append(int(status_line.split()[0]))
+            for name, value in headers:
+                if name.lower() == 'content-length':
+                    state.bytes_sent += int(value)
+            return start_response(status_line, headers, exc_info)
+
+        try:
+            return self.wsgi_app(environ, recording_start_response)
+        except Exception:
+            status.append(500)
+            raise
+        finally:
+            state.requests += 1
+            if not status or status[-1] >= 500:
+                state.errors += 1
+            if environ.get('aes.cache_hit'):
+                state.cache_hits += 1
+            state.busy_seconds += time.time() - state.busy_since
+            state.busy_since = 0.0
+            state.publish()
+
+
+def preload(app):
+    """
+    Import and exercise everything workers need so it is loaded once, before fork
+    """
+    from flask import render_template
+
+    from aes_backends import BACKENDS, get_backend
+    from aes_engine import AES256WithSteps
+    import key_derivation  # noqa: F401
+    import step_codec  # noqa: F401
+
+    for name in BACKENDS:
+        try:
+            backend = get_backend(name)
+        except ValueError:
+            continue  # Optional dependency (NumPy) not installed
+        for mode in backend.modes:
+            # Loads the pycryptodome modules of every mode and primes the round text
+            aes = AES256WithSteps(bytes(32), mode, bytes(16), backend=name)
+            aes.decrypt(aes.encrypt(bytes(32)))
+
+    try:
+        import xmind_exporter  # noqa: F401
+    except ImportError:
+        pass  # Exports fall back to text files without the xmind package
+
+    with app.test_request_context('/'):
+        render_template('index.html')
+
+    # Move everything allocated so far out of the collector's reach; otherwise
+    # a collection in a worker writes to (and so copies) every shared page
+    gc.collect()
+    gc.freeze()
+
+
+def run_worker(index, listener, table, args, app):
+    """Serve requests from the shared listening socket until SIGTERM"""
+    from werkzeug.serving import WSGIRequestHandler, make_server
+
+    stopping = []
+    signal.signal(signal.SIGTERM, lambda signum, frame: stopping.append(signum))
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # The parent handles Ctrl+C
+
+    class RequestHandler(WSGIRequestHandler):
+        def log_request(self, *log_args):
+            if not args.quiet:
+                super().log_request(*log_args)
+
+    state = WorkerState(table, index)
+    server = make_server(args.host, args.port, StatsMiddleware(app.wsgi_app, state),
+                         request_handler=RequestHandler, fd=listener.fileno())
+    # Idle workers must not block in accept(), or they could not send heartbeats
+    server.socket.setblocking(False)
+
+    def service_actions():
+        if stopping:
+            # Finish between requests: leaves serve_forever without dropping a connection
+            raise SystemExit(0)
+        state.publish()
+
+    server.service_actions = service_actions
+    server.serve_forever(poll_interval=HEARTBEAT_INTERVAL)
+
+
+def _spawn(index, listener, table, args, app):
+    table.reset(index, table.restarts(index))
+    pid = os.fork()
+    if pid == 0:
+        code = 0
+        try:
+            run_worker(index, listener, table, args, app)
+        except SystemExit as e:
+            code = e.code or 0
+        except BaseException:
+            import traceback
+
+            traceback.print_exc()
+            code = 1
+        finally:
+            os._exit(code)
+    return pid
+
+
+def serve(args):
+    from app import app
+    from shared_cache import FileCache
+
+    cache = None
+    if not args.no_cache:
+        try:
+            cache = FileCache(args.cache_dir, max_entries=args.cache_entries, max_bytes=args.cache_size)
+        except ValueError as e:
+            print(f"prefork_server.py: {e}", file=sys.stderr)
+            return 1
+        app.config['SHARED_CACHE'] = cache
+
+    table = StatsTable(args.workers)
+
+    @app.route('/stats')
+    def stats():
+        report = table.report(args.timeout)
+        report["cache"] = cache.stats() if cache is not None else None
+        return report
+
+    listener = socket.create_server((args.host, args.port), backlog=args.backlog)
+    listener.set_inheritable(True)
+    args.port = listener.getsockname()[1]
+
+    start = time.perf_counter()
+    preload(app)
+    print(f"Preloaded in {(time.perf_counter() - start) * 1000:.0f} ms; "
+          f"serving on http://{args.host}:{args.port} with {args.workers} workers"
+          f"{f', cache in {cache.directory}' if cache else ''}", file=sys.stderr)
+
+    stopping = []
+    signal.signal(signal.SIGTERM, lambda signum, frame: stopping.append(signum))
+    signal.signal(signal.SIGINT, lambda signum, frame: stopping.append(signum))
+
+    workers = {_spawn(index, listener, table, args, app): index for index in range(args.workers)}
+    last_report = time.time()
+    try:
+        while not stopping:
+            time.sleep(HEARTBEAT_INTERVAL)
+            now = time.time()
+
+            # Restart workers that exited
+            while True:
+                try:
+                    pid, status = os.waitpid(-1, os.WNOHANG)
+                except ChildProcessError:
+                    break
+                if pid == 0:
+                    break
+                index = workers.pop(pid, None)
+                if index is not None and not stopping:
+                    print(f"Worker {index} (pid {pid}) exited with status {os.waitstatus_to_exitcode(status)}; "
+                          f"restarting", file=sys.stderr)
+                    table.reset(index, table.restarts(index) + 1)
+                    workers[_spawn(index, listener, table, args, app)] = index
+
+            # Kill workers that are stuck in a request or no longer send heartbeats
+            for pid, index in list(workers.items()):
+                slot = table.read(index)
+                if slot["pid"] and not table.healthy(slot, args.timeout, now):
+                    print(f"Worker {index} (pid {pid}) is unresponsive; killing", file=sys.stderr)
+                    try:
+                        os.kill(pid, signal.SIGKILL)
+                    except ProcessLookupError:
+                        pass
+
+            if args.stats_interval and now - last_report >= args.stats_interval:
+                last_report = now
+                _print_report(table.report(args.timeout))
+    finally:
+        for pid in workers:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        deadline = time.time() + args.graceful_timeout
+        while workers and time.time() < deadline:
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid:
+                workers.pop(pid, None)
+            else:
+                time.sleep(0.05)
+        for pid in workers:
+            try:
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+            except (ProcessLookupError, ChildProcessError):
+                pass
+        _print_report(table.report(args.timeout))
+        if cache is not None:
+            cache.close()
+        listener.close()
+    return 0
+
+
+def _print_report(report):
+    print(f"{'worker':>6}{'pid':>8}{'health':>9}{'requests':>10}{'req/s':>9}{'avg ms':>9}"
+          f"{'hits':>7}{'errors':>8}{'rss MB':>8}{'priv MB':>9}", file=sys.stderr)
+    for worker in report["workers"]:
+        print(f"{worker['worker']:>6}{worker['pid']:>8}{'ok' if worker['healthy'] else 'DOWN':>9}"
+              f"{worker['requests']:>10}{worker['requests_per_second']:>9.2f}{worker['average_ms']:>9.1f}"
+              f"{worker['cache_hits']:>7}{worker['errors']:>8}{worker['rss_mb']:>8.1f}{worker['private_mb']:>9.1f}",
+              file=sys.stderr)
+
+
+def build_parser():
+    from aes_cli import parse_size
+
+    parser = argparse.ArgumentParser(description="Serve app.py with pre-forked worker processes.")
+    parser.add_argument('--host', default='127.0.0.1', help="Address to bind (default: 127.0.0.1)")
+    parser.add_argument('-p', '--port', type=int, default=8000, help="Port to bind, 0 for any free port (default: 8000)")
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count() or 1,
+                        help="Worker processes (default: number of CPUs)")
+    parser.add_argument('--backlog', type=int, default=128, help="Listen queue length (default: 128)")
+    parser.add_argument('--timeout', type=float, default=30.0,
+                        help="Seconds before a busy or silent worker is killed and restarted (default: 30)")
+    parser.add_argument('--graceful-timeout', type=float, default=10.0,
+                        help="Seconds workers get to finish their request on shutdown (default: 10)")
+    parser.add_argument('--cache-dir',
+                        help="Shared cache directory, mode 700 and owned by the server user; its entries "
+                             "are deleted on shutdown (default: a private directory under /dev/shm)")
+    parser.add_argument('--cache-entries', type=int, default=512, help="Most cached results and files (default: 512)")
+    parser.add_argument('--cache-size', type=parse_size, default=256 * 1024 * 1024,
+                        help="Most cached bytes, accepts K/M/G suffixes (default: 256M)")
+    parser.add_argument('--no-cache', action='store_true', help="Disable the shared result/XMind cache")
+    parser.add_argument('--stats-interval', type=float, default=0,
+                        help="Print worker statistics every N seconds (default: only on shutdown)")
+    parser.add_argument('-q', '--quiet', action='store_true', help="Do not log individual requests")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if not hasattr(os, 'fork'):
+        print("prefork_server.py: requires a POSIX system (os.fork)", file=sys.stderr)
+        return 1
+    if args.workers < 1:
+        print("prefork_server.py: --workers must be at least 1", file=sys.stderr)
+        return 1
+    return serve(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
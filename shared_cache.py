@@ -0,0 +1,173 @@
+# shared_cache.py
+# Bounded cache of response bodies and generated files shared by every
+# worker process. Entries are plain files in one directory (tmpfs under
+# /dev/shm when available, so they live in shared memory), written
+# atomically and evicted oldest-first, so workers need no locking.
+# Entries hold keys and plaintext from the traces, so the directory and
+# every file in it are private to the server's user.
+import hashlib
+import hmac
+import os
+import re
+import shutil
+import stat
+import tempfile
+
+SHARED_MEMORY_ROOT = '/dev/shm'
+
+# Names of published and in-progress entries (HMAC hex digest [.pid.tmp] + suffix)
+ENTRY_NAME = re.compile(r'[0-9a-f]{64}(\.\d+\.tmp)?\.\w+')
+
+
+def keyed_digest(secret, *fields):
+    """
+    HMAC-SHA256 under secret of a sequence of str/bytes fields
+
+    Used for cache lookup keys, so the fields (passphrases, keys, plaintext)
+    are never stored and the digests are useless without the secret.
+    """
+    message = b''
+    for field in fields:
+        if isinstance(field, str):
+            field = field.encode('utf-8')
+        # Length-prefix every field so different splits never collide
+        message += len(field).to_bytes(4, 'big') + field
+    return hmac.new(secret, message, hashlib.sha256).digest()
+
+
+class FileCache:
+    """
+    Cross-process LRU cache backed by files in a private directory.
+
+    Keys are HMAC-SHA256 digests under a secret chosen when the cache is
+    created (before workers are forked, so all workers share it); file names
+    therefore never reveal the request fields they were derived from.
+    """
+
+    def __init__(self, directory=None, max_entries=512, max_bytes=256 * 1024 * 1024):
+        """
+        Args:
+            directory (str): Cache directory, created with mode 0700; an existing one
+                must belong to the current user and not be accessible to anyone else
+                (default: a new directory under /dev/shm, else the system temp directory)
+            max_entries (int): Most files kept
+            max_bytes (int): Most bytes kept across all files
+        """
+        if directory is None:
+            root = SHARED_MEMORY_ROOT if os.path.isdir(SHARED_MEMORY_ROOT) else None
+            directory = tempfile.mkdtemp(prefix='aes-cache-', dir=root)
+            self.owned = True
+        else:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+            # makedirs leaves an existing directory's owner and mode untouched
+            info = os.lstat(directory)
+            if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid():
+                raise ValueError(f"Cache directory {directory} must be a directory owned by the current user")
+            if info.st_mode & 0o077:
+                raise ValueError(f"Cache directory {directory} must not be accessible to other users "
+                                 f"(mode {stat.S_IMODE(info.st_mode):o}, expected 700)")
+            self.owned = False
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._secret = os.urandom(32)
+
+    def key_for(self, *fields):
+        """Cache key for a sequence of str/bytes fields"""
+        return keyed_digest(self._secret, *fields).hex()
+
+    def path(self, key, suffix):
+        """Location of the entry key + suffix (it may not exist)"""
+        return os.path.join(self.directory, key + suffix)
+
+    def get(self, key, suffix='.json'):
+        """Return the stored bytes, or None on a miss"""
+        path = self.path(key, suffix)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        self.touch(path)
+        return data
+
+    def touch(self, path):
+        """Mark an entry as recently used"""
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass  # Evicted by another worker in the meantime
+
+    def temp_path(self, key, suffix):
+        """Private path to build an entry at before publishing it with commit()"""
+        return self.path(f'{key}.{os.getpid()}.tmp', suffix)
+
+    def commit(self, temp_path, key, suffix):
+        """Atomically publish a file written at temp_path, then enforce the bounds"""
+        # Files written by other code (e.g. the XMind exporter) get the umask's mode
+        os.chmod(temp_path, 0o600)
+        os.replace(temp_path, self.path(key, suffix))
+        self._evict()
+
+    def put(self, key, data, suffix='.json'):
+        temp_path = self.temp_path(key, suffix)
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_NOFOLLOW, 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        self.commit(temp_path, key, suffix)
+
+    def _evict(self):
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                if '.tmp' in entry.name:
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+        entries.sort()
+        count = len(entries)
+        for _, size, path in entries:
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass  # Another worker evicted it first
+            count -= 1
+            total -= size
+
+    def stats(self):
+        """Number of entries and bytes currently stored"""
+        count = 0
+        total = 0
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                if '.tmp' not in entry.name:
+                    try:
+                        total += entry.stat().st_size
+                        count += 1
+                    except FileNotFoundError:
+                        continue
+        return {"entries": count, "bytes": total,
+                "max_entries": self.max_entries, "max_bytes": self.max_bytes}
+
+    def close(self):
+        """
+        Remove the stored entries, and the directory too if this cache created it.
+        Entries are unreadable by key once the secret is gone, so none are worth keeping.
+        """
+        if self.owned:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            return
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                if ENTRY_NAME.fullmatch(entry.name):
+                    try:
+                        os.remove(entry.path)
+                    except FileNotFoundError:
+                        pass
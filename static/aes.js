@@ -6,7 +6,10 @@ document.addEventListener("DOMContentLoaded", function () {
     const downloadLink = document.getElementById("download-link");
     const modeSelect = document.getElementById("mode-select");
     const ivSection = document.getElementById("iv-section");
+    const aadSection = document.getElementById("aad-section");
     const keyInput = document.getElementById("key-input");
+    const keyTypeSelect = document.getElementById("key-type-select");
+    const backendSelect = document.getElementById("backend-select");
     const ivInput = document.getElementById("iv-input");
     const textInput = document.getElementById("text-input");
     const keyLengthSpan = document.getElementById("key-length");
@@ -35,9 +38,12 @@ document.addEventListener("DOMContentLoaded", function () {
             // Show English elements
             document.getElementById('instructions-en').style.display = 'block';
             document.getElementById('text-label-en').style.display = 'block';
+            document.getElementById('key-type-label-en').style.display = 'block';
             document.getElementById('key-label-en').style.display = 'block';
             document.getElementById('mode-label-en').style.display = 'block';
+            document.getElementById('backend-label-en').style.display = 'block';
             document.getElementById('iv-label-en').style.display = 'block';
+            document.getElementById('aad-label-en').style.display = 'block';
             document.getElementById('buttons-en').style.display = 'block';
             document.getElementById('text-counter-en').style.display = 'inline';
             document.getElementById('key-counter-en').style.display = 'inline';
@@ -48,9 +54,12 @@ document.addEventListener("DOMContentLoaded", function () {
             // Hide Arabic elements
             document.getElementById('instructions-ar').style.display = 'none';
             document.getElementById('text-label-ar').style.display = 'none';
+            document.getElementById('key-type-label-ar').style.display = 'none';
             document.getElementById('key-label-ar').style.display = 'none';
             document.getElementById('mode-label-ar').style.display = 'none';
+            document.getElementById('backend-label-ar').style.display = 'none';
             document.getElementById('iv-label-ar').style.display = 'none';
+            document.getElementById('aad-label-ar').style.display = 'none';
             document.getElementById('buttons-ar').style.display = 'none';
             document.getElementById('text-counter-ar').style.display = 'none';
             document.getElementById('key-counter-ar').style.display = 'none';
@@ -77,9 +86,12 @@ document.addEventListener("DOMContentLoaded", function () {
             // Show Arabic elements
             document.getElementById('instructions-ar').style.display = 'block';
             document.getElementById('text-label-ar').style.display = 'block';
+            document.getElementById('key-type-label-ar').style.display = 'block';
             document.getElementById('key-label-ar').style.display = 'block';
             document.getElementById('mode-label-ar').style.display = 'block';
+            document.getElementById('backend-label-ar').style.display = 'block';
             document.getElementById('iv-label-ar').style.display = 'block';
+            document.getElementById('aad-label-ar').style.display = 'block';
             document.getElementById('buttons-ar').style.display = 'block';
             document.getElementById('text-counter-ar').style.display = 'inline';
             document.getElementById('key-counter-ar').style.display = 'inline';
@@ -90,9 +102,12 @@ document.addEventListener("DOMContentLoaded", function () {
             // Hide English elements
             document.getElementById('instructions-en').style.display = 'none';
             document.getElementById('text-label-en').style.display = 'none';
+            document.getElementById('key-type-label-en').style.display = 'none';
             document.getElementById('key-label-en').style.display = 'none';
             document.getElementById('mode-label-en').style.display = 'none';
+            document.getElementById('backend-label-en').style.display = 'none';
             document.getElementById('iv-label-en').style.display = 'none';
+            document.getElementById('aad-label-en').style.display = 'none';
             document.getElementById('buttons-en').style.display = 'none';
             document.getElementById('text-counter-en').style.display = 'none';
             document.getElementById('key-counter-en').style.display = 'none';
@@ -170,15 +185,20 @@ document.addEventListener("DOMContentLoaded", function () {
     langEnBtn.addEventListener('click', () => switchLanguage('en'));
     langArBtn.addEventListener('click', () => switchLanguage('ar'));
 
-    // Show/hide IV section based on mode selection
+    // Modes that take a nonce rather than an IV, and modes that authenticate associated data
+    const NONCE_MODES = ["CTR", "GCM", "EAX", "SIV"];
+    const AEAD_MODES = ["GCM", "EAX", "SIV"];
+
+    // Show/hide IV and associated data sections based on mode selection
     modeSelect.addEventListener("change", function() {
         const ivLabel = document.getElementById("iv-label");
+        aadSection.style.display = AEAD_MODES.includes(this.value) ? "block" : "none";
         if (this.value === "ECB") {
             ivSection.style.display = "none";
         } else {
             ivSection.style.display = "block";
             // Update label based on mode
-            if (this.value === "CTR") {
+            if (NONCE_MODES.includes(this.value)) {
                 ivLabel.textContent = "Nonce (exactly 16 characters):";
             } else {
                 ivLabel.textContent = "IV (exactly 16 characters):";
@@ -186,6 +206,18 @@ document.addEventListener("DOMContentLoaded", function () {
         }
     });
 
+    // The reference backends only implement the unauthenticated modes
+    backendSelect.addEventListener("change", function() {
+        const aeadAvailable = this.value === "pycryptodome";
+        Array.from(modeSelect.options).forEach(option => {
+            if (AEAD_MODES.includes(option.value)) option.disabled = !aeadAvailable;
+        });
+        if (!aeadAvailable && AEAD_MODES.includes(modeSelect.value)) {
+            modeSelect.value = "CTR";
+            modeSelect.dispatchEvent(new Event("change"));
+        }
+    });
+
     // Update text length counter (bytes and characters)
     textInput.addEventListener("input", function() {
         const text = this.value;
@@ -212,10 +244,17 @@ document.addEventListener("DOMContentLoaded", function () {
         document.getElementById('text-length-ar').style.fontWeight = weight;
     });
 
+    // Raw keys must be exactly 32 characters; passphrases may be any non-empty length
+    keyTypeSelect.addEventListener("change", function() {
+        keyInput.maxLength = this.value === "raw" ? 32 : 256;
+        keyInput.dispatchEvent(new Event("input"));
+    });
+
     // Update key length counter
     keyInput.addEventListener("input", function() {
         const length = this.value.length;
-        const color = length === 32 ? "#28a745" : "#dc3545";
+        const valid = keyTypeSelect.value === "raw" ? length === 32 : length > 0;
+        const color = valid ? "#28a745" : "#dc3545";
         
         // Update English counter
         keyLengthSpan.textContent = length;
@@ -242,6 +281,12 @@ document.addEventListener("DOMContentLoaded", function () {
         });
     }
 
+    // Virtual lists measure their viewport, so re-render once a hidden view is shown
+    function refreshVisibleLists() {
+        if (blocksList) blocksList.refresh();
+        if (stepsList) stepsList.refresh();
+    }
+
     // View toggle functionality - English buttons
     flowchartBtn.addEventListener("click", function() {
         flowchartBtn.classList.add("active");
@@ -250,6 +295,7 @@ document.addEventListener("DOMContentLoaded", function () {
         document.getElementById("steps-btn-ar").classList.remove("active");
         flowchartContainer.style.display = "block";
         animationDiv.style.display = "none";
+        refreshVisibleLists();
     });
 
     stepsBtn.addEventListener("click", function() {
@@ -259,6 +305,7 @@ document.addEventListener("DOMContentLoaded", function () {
         document.getElementById("flowchart-btn-ar").classList.remove("active");
         flowchartContainer.style.display = "none";
         animationDiv.style.display = "block";
+        refreshVisibleLists();
     });
     
     // View toggle functionality - Arabic buttons
@@ -269,6 +316,7 @@ document.addEventListener("DOMContentLoaded", function () {
         stepsBtn.classList.remove("active");
         flowchartContainer.style.display = "block";
         animationDiv.style.display = "none";
+        refreshVisibleLists();
     });
 
     document.getElementById("steps-btn-ar").addEventListener("click", function() {
@@ -278,6 +326,7 @@ document.addEventListener("DOMContentLoaded", function () {
         flowchartBtn.classList.remove("active");
         flowchartContainer.style.display = "none";
         animationDiv.style.display = "block";
+        refreshVisibleLists();
     });
 
     form.addEventListener("submit", async function (e) {
@@ -298,9 +347,12 @@ document.addEventListener("DOMContentLoaded", function () {
         const formData = new FormData(form);
         const action = e.submitter.value;
         formData.append("action", action);
+        // Ask for the template-compressed trace; expandTrace rebuilds the steps
+        formData.append("trace_format", "compact");
 
         const processingMsg = currentLang === 'en' ? "Processing..." : "جاري المعالجة...";
         resultDiv.innerHTML = processingMsg;
+        resetTraceViews();
         animationDiv.innerHTML = "";
         downloadLink.style.display = "none";
         viewControls.style.display = "none";
@@ -318,6 +370,8 @@ document.addEventListener("DOMContentLoaded", function () {
             return;
         }
 
+        const steps = data.trace ? expandTrace(data.trace) : data.steps;
+
         const outputLabel = currentLang === 'en' ? 'Output:' : 'النتيجة:';
         resultDiv.innerHTML = `<b>${outputLabel}</b> <code>${data.result}</code>`;
         
@@ -325,13 +379,17 @@ document.addEventListener("DOMContentLoaded", function () {
         viewControls.style.display = "block";
         
         // Show and populate flowchart (default view)
-        showFlowchart(data.steps, data.result, action);
+        showFlowchart(steps, data.result, action);
         
         // Prepare traditional step animation (hidden initially)
-        animateSteps(data.steps);
+        animateSteps(steps);
         animationDiv.style.display = "none";
         
-        downloadLink.style.display = "inline-block";
+        // Each result has its own XMind file when workers share a cache
+        if (data.download) {
+            downloadLink.href = data.download;
+            downloadLink.style.display = "inline-block";
+        }
     });
 
     function showFlowchart(steps, result, action) {
@@ -362,7 +420,7 @@ document.addEventListener("DOMContentLoaded", function () {
             ivDisplayBox.style.display = "none";
         } else {
             ivDisplayBox.style.display = "block";
-            const ivLabel = modeValue === "CTR" ? "Nonce" : "IV";
+            const ivLabel = NONCE_MODES.includes(modeValue) ? "Nonce" : "IV";
             document.querySelector("#iv-display-box .box-title").textContent = ivLabel;
             ivDisplay.textContent = ivValue || "Auto-generated";
         }
@@ -371,7 +429,7 @@ document.addEventListener("DOMContentLoaded", function () {
         blocksContainer.innerHTML = "";
 
         // Create block processing visualization
-        createBlockProcessing(steps, blocksContainer, action);
+        blocksList = createBlockProcessing(steps, blocksContainer, action);
 
         // Show flowchart
         flowchartContainer.style.display = "block";
@@ -380,67 +438,255 @@ document.addEventListener("DOMContentLoaded", function () {
         animateFlowchartStages(steps);
     }
 
-    function createBlockProcessing(steps, container, action) {
-        // Find block-related steps
-        const blockSteps = steps.filter(step => 
-            step.step.includes("Block") || 
-            step.step.includes("Encryption") || 
-            step.step.includes("Decryption")
-        );
+    // Rebuild {step, detail} objects from the compact trace format (see step_codec.py):
+    // each record is [name template, detail template, ...values], and a template is
+    // the list of literal segments that the values are inserted between
+    function expandTrace(trace) {
+        const fill = (segments, values) => {
+            let text = segments[0];
+            for (let i = 1; i < segments.length; i++) {
+                text += String(values[i - 1]) + segments[i];
+            }
+            return text;
+        };
+        return trace.records.map(record => {
+            const nameSegments = trace.templates[record[0]];
+            const detailSegments = trace.templates[record[1]];
+            const split = 2 + nameSegments.length - 1;
+            return {
+                step: fill(nameSegments, record.slice(2, split)),
+                detail: fill(detailSegments, record.slice(split))
+            };
+        });
+    }
 
-        if (blockSteps.length === 0) return;
+    // Row heights (px) for the virtualized views; must match .virtual-row styles in style.css
+    const BLOCK_HEADER_HEIGHT = 44;
+    const BLOCK_STEP_HEIGHT = 150;
+    const STEP_CARD_HEIGHT = 230;
+    const OVERSCAN_ROWS = 4;
+
+    // Animation pacing: 800ms per step for short traces, but never more than
+    // MAX_ANIMATION_MS in total; several steps are advanced per frame when needed
+    const STEP_INTERVAL_MS = 800;
+    const MAX_ANIMATION_MS = 20000;
+
+    // Active virtual lists and animation handles, torn down on every new result
+    let blocksList = null;
+    let stepsList = null;
+    let animationTimers = [];
+    let animationFrames = [];
+
+    function cancelAnimations() {
+        animationTimers.forEach(id => clearTimeout(id));
+        animationFrames.forEach(id => cancelAnimationFrame(id));
+        animationTimers = [];
+        animationFrames = [];
+    }
 
-        // Group steps by block
-        const blockGroups = {};
-        blockSteps.forEach(step => {
-            const blockMatch = step.step.match(/Block (\d+)/);
-            if (blockMatch) {
-                const blockNum = blockMatch[1];
-                if (!blockGroups[blockNum]) {
-                    blockGroups[blockNum] = [];
+    function resetTraceViews() {
+        cancelAnimations();
+        if (blocksList) blocksList.destroy();
+        if (stepsList) stepsList.destroy();
+        blocksList = null;
+        stepsList = null;
+    }
+
+    function schedule(callback, delay) {
+        animationTimers.push(setTimeout(callback, delay));
+    }
+
+    function nextFrame(callback) {
+        animationFrames.push(requestAnimationFrame(callback));
+    }
+
+    /**
+     * Windowed list: only rows intersecting the viewport (plus a few rows of
+     * overscan) exist in the DOM. Row heights are fixed per row and known up
+     * front, so offsets are computed once and the first visible row is found
+     * by binary search.
+     */
+    function createVirtualList(viewport, count, rowHeight, renderRow) {
+        const spacer = document.createElement("div");
+        spacer.className = "virtual-spacer";
+        viewport.appendChild(spacer);
+
+        let offsets = new Float64Array(0);
+        let rowCount = 0;
+        let rendered = new Map();
+        let framePending = false;
+
+        function setCount(newCount) {
+            const newOffsets = new Float64Array(newCount + 1);
+            const keep = Math.min(rowCount, newCount);
+            newOffsets.set(offsets.subarray(0, keep + 1));
+            for (let i = keep; i < newCount; i++) {
+                newOffsets[i + 1] = newOffsets[i] + rowHeight(i);
+            }
+            offsets = newOffsets;
+            rowCount = newCount;
+            spacer.style.height = `${offsets[rowCount]}px`;
+            render();
+        }
+
+        function firstRowAt(position) {
+            let low = 0;
+            let high = rowCount;
+            while (low < high) {
+                const mid = (low + high) >> 1;
+                if (offsets[mid + 1] <= position) {
+                    low = mid + 1;
+                } else {
+                    high = mid;
                 }
-                blockGroups[blockNum].push(step);
             }
-        });
+            return low;
+        }
 
-        // Create visual blocks
-        Object.keys(blockGroups).forEach(blockNum => {
-            const blockContainer = document.createElement("div");
-            blockContainer.className = "block-container";
-            blockContainer.innerHTML = `
-                <div class="block-header">Block ${blockNum} Processing</div>
-                <div class="block-steps" id="block-${blockNum}-steps"></div>
-            `;
-            container.appendChild(blockContainer);
-
-            const stepsContainer = blockContainer.querySelector(`#block-${blockNum}-steps`);
-            blockGroups[blockNum].forEach(step => {
-                const stepEl = document.createElement("div");
-                stepEl.className = "block-step";
-                
-                // Extract matrix data if available
-                const lines = step.detail.split('\n');
-                let content = step.step;
-                
-                // Look for hex data
-                const hexMatch = step.detail.match(/([A-F0-9]{32,})/);
-                if (hexMatch) {
-                    content += `<br><div class="matrix-display">${formatAsMatrix(hexMatch[1])}</div>`;
+        function render(force) {
+            framePending = false;
+            const top = viewport.scrollTop;
+            const bottom = top + viewport.clientHeight;
+            const start = Math.max(0, firstRowAt(top) - OVERSCAN_ROWS);
+            let end = start;
+            while (end < rowCount && offsets[end] < bottom) end++;
+            end = Math.min(rowCount, end + OVERSCAN_ROWS);
+
+            rendered.forEach((el, index) => {
+                if (force || index < start || index >= end) {
+                    el.remove();
+                    rendered.delete(index);
                 }
-                
-                stepEl.innerHTML = content;
-                stepsContainer.appendChild(stepEl);
             });
+
+            const fragment = document.createDocumentFragment();
+            for (let i = start; i < end; i++) {
+                if (rendered.has(i)) continue;
+                const row = renderRow(i);
+                row.classList.add("virtual-row");
+                row.style.top = `${offsets[i]}px`;
+                row.style.height = `${rowHeight(i)}px`;
+                rendered.set(i, row);
+                fragment.appendChild(row);
+            }
+            spacer.appendChild(fragment);
+        }
+
+        function onScroll() {
+            if (framePending) return;
+            framePending = true;
+            requestAnimationFrame(() => render(false));
+        }
+
+        viewport.addEventListener("scroll", onScroll);
+        setCount(count);
+
+        return {
+            setCount,
+            // Re-render visible rows, e.g. after the active row changed
+            refresh: () => render(true),
+            scrollToRow(index) {
+                const rowTop = offsets[index];
+                const rowBottom = offsets[index + 1];
+                if (rowTop < viewport.scrollTop || rowBottom > viewport.scrollTop + viewport.clientHeight) {
+                    viewport.scrollTop = rowTop;
+                }
+            },
+            isAtBottom: () => viewport.scrollTop + viewport.clientHeight >= offsets[rowCount] - 4,
+            scrollToBottom() {
+                viewport.scrollTop = offsets[rowCount];
+            },
+            destroy() {
+                viewport.removeEventListener("scroll", onScroll);
+                viewport.innerHTML = "";
+                rendered = new Map();
+            }
+        };
+    }
+
+    function createBlockProcessing(steps, container, action) {
+        // Group block steps by block number in a single pass
+        const blockGroups = new Map();
+        steps.forEach(step => {
+            if (!(step.step.includes("Block") ||
+                  step.step.includes("Encryption") ||
+                  step.step.includes("Decryption"))) return;
+            const blockMatch = step.step.match(/Block (\d+)/);
+            if (!blockMatch) return;
+            const blockNum = blockMatch[1];
+            if (!blockGroups.has(blockNum)) {
+                blockGroups.set(blockNum, []);
+            }
+            blockGroups.get(blockNum).push(step);
+        });
+
+        if (blockGroups.size === 0) return null;
+
+        // Flatten into rows: one header per block followed by its steps
+        const rows = [];
+        blockGroups.forEach((blockSteps, blockNum) => {
+            rows.push({ header: true, blockNum });
+            blockSteps.forEach(step => rows.push({ header: false, step, matrix: undefined }));
+        });
+
+        const viewport = document.createElement("div");
+        viewport.className = "virtual-viewport blocks-viewport";
+        container.appendChild(viewport);
+
+        let activeRow = -1;
+        const list = createVirtualList(
+            viewport,
+            rows.length,
+            i => rows[i].header ? BLOCK_HEADER_HEIGHT : BLOCK_STEP_HEIGHT,
+            i => {
+                const row = rows[i];
+                const el = document.createElement("div");
+                if (row.header) {
+                    el.className = "block-header";
+                    el.textContent = `Block ${row.blockNum} Processing`;
+                    return el;
+                }
+                el.className = i === activeRow ? "block-step active" : "block-step";
+                const title = document.createElement("div");
+                title.textContent = row.step.step;
+                el.appendChild(title);
+
+                // Matrix markup is built the first time the row is shown, then reused
+                if (row.matrix === undefined) {
+                    const hexMatch = row.step.detail.match(/([A-F0-9]{32,})/);
+                    row.matrix = hexMatch ? formatAsMatrix(hexMatch[1]) : null;
+                }
+                if (row.matrix) {
+                    const matrix = document.createElement("div");
+                    matrix.className = "matrix-display";
+                    matrix.innerHTML = row.matrix;
+                    el.appendChild(matrix);
+                }
+                return el;
+            }
+        );
+
+        const stepRows = [];
+        rows.forEach((row, i) => {
+            if (!row.header) stepRows.push(i);
         });
+
+        list.stepRows = stepRows;
+        list.setActiveRow = index => {
+            activeRow = index;
+            list.scrollToRow(index);
+            list.refresh();
+        };
+        return list;
     }
 
     function formatAsMatrix(hexString) {
-        // Format hex string as 4x4 matrix
-        let matrix = "";
+        // Format hex string as 4x4 matrix (hex digits only, so safe as markup)
+        const cells = [];
         for (let i = 0; i < Math.min(32, hexString.length); i += 2) {
-            matrix += `<div class="matrix-cell">${hexString.substr(i, 2)}</div>`;
+            cells.push(`<div class="matrix-cell">${hexString.substr(i, 2)}</div>`);
         }
-        return matrix;
+        return cells.join("");
     }
 
     function animateFlowchartStages(steps) {
@@ -469,7 +715,7 @@ document.addEventListener("DOMContentLoaded", function () {
                     animateBlockSteps();
                 }
                 
-                setTimeout(activateNextStage, 1500);
+                schedule(activateNextStage, 1500);
             } else {
                 // Mark last stage as completed
                 if (stageOrder.length > 0) {
@@ -480,43 +726,90 @@ document.addEventListener("DOMContentLoaded", function () {
         }
 
         // Start animation
-        setTimeout(activateNextStage, 500);
+        schedule(activateNextStage, 500);
     }
 
     function animateBlockSteps() {
-        const blockSteps = document.querySelectorAll(".block-step");
-        let stepIndex = 0;
-
-        function highlightNextStep() {
-            if (stepIndex < blockSteps.length) {
-                // Remove previous highlight
-                if (stepIndex > 0) {
-                    blockSteps[stepIndex - 1].classList.remove("active");
-                }
-                
-                // Highlight current step
-                blockSteps[stepIndex].classList.add("active");
-                stepIndex++;
-                
-                setTimeout(highlightNextStep, 800);
+        if (!blocksList) return;
+        const stepRows = blocksList.stepRows;
+        const interval = Math.min(STEP_INTERVAL_MS, MAX_ANIMATION_MS / stepRows.length);
+        let start = null;
+        let shown = -1;
+
+        function highlight(timestamp) {
+            if (!blocksList) return;
+            if (start === null) start = timestamp;
+            // Jump straight to the step due at this frame instead of visiting each one
+            const due = Math.min(stepRows.length - 1, Math.floor((timestamp - start) / interval));
+            if (due !== shown) {
+                shown = due;
+                blocksList.setActiveRow(stepRows[due]);
+            }
+            if (due < stepRows.length - 1) {
+                nextFrame(highlight);
             }
         }
 
-        setTimeout(highlightNextStep, 500);
+        schedule(() => nextFrame(highlight), 500);
     }
 
     function animateSteps(steps) {
-        let i = 0;
-        function showStep() {
-            if (i >= steps.length) return;
+        const viewport = document.createElement("div");
+        viewport.className = "virtual-viewport steps-viewport";
+        animationDiv.appendChild(viewport);
+
+        stepsList = createVirtualList(viewport, 0, () => STEP_CARD_HEIGHT, i => {
             const step = steps[i];
             const stepEl = document.createElement("div");
             stepEl.className = "step-card";
-            stepEl.innerHTML = `<strong>${step.step}</strong><pre>${step.detail}</pre>`;
-            animationDiv.appendChild(stepEl);
-            i++;
-            setTimeout(showStep, 800);
+            const title = document.createElement("strong");
+            title.textContent = step.step;
+            const detail = document.createElement("pre");
+            detail.textContent = step.detail;
+            stepEl.appendChild(title);
+            stepEl.appendChild(detail);
+            return stepEl;
+        });
+
+        const interval = Math.min(STEP_INTERVAL_MS, MAX_ANIMATION_MS / Math.max(steps.length, 1));
+        let start = null;
+        let revealed = 0;
+
+        function reveal(timestamp) {
+            if (!stepsList) return;
+            if (start === null) start = timestamp;
+            const due = Math.min(steps.length, Math.floor((timestamp - start) / interval) + 1);
+            if (due !== revealed) {
+                // Follow new steps only while the reader is already at the bottom
+                const follow = stepsList.isAtBottom();
+                revealed = due;
+                stepsList.setCount(revealed);
+                if (follow) stepsList.scrollToBottom();
+            }
+            if (revealed < steps.length) {
+                nextFrame(reveal);
+            }
         }
-        showStep();
+
+        stepsList.revealAll = () => {
+            revealed = steps.length;
+            stepsList.setCount(steps.length);
+        };
+        nextFrame(reveal);
     }
+
+    function skipAnimation() {
+        cancelAnimations();
+        document.querySelectorAll(".flow-stage").forEach(stage => {
+            stage.classList.remove("active");
+            stage.classList.add("completed");
+        });
+        if (stepsList) stepsList.revealAll();
+        if (blocksList && blocksList.stepRows.length > 0) {
+            blocksList.setActiveRow(blocksList.stepRows[blocksList.stepRows.length - 1]);
+        }
+    }
+
+    document.getElementById("skip-animation-btn").addEventListener("click", skipAnimation);
+    document.getElementById("skip-animation-btn-ar").addEventListener("click", skipAnimation);
 });
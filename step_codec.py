@@ -0,0 +1,129 @@
+# step_codec.py
+# Compact wire format for step traces. Most of a trace is boilerplate that
+# repeats for every round of every block; only block/round numbers and state
+# bytes change. Each string is split into literal text and variable tokens
+# (decimal numbers and hex runs); the literal parts are sent once in a
+# template table and every step carries just template ids and token values.
+import re
+
+FORMAT_VERSION = 1
+
+# Decimal numbers and upper-case hex runs containing at least one digit
+# (block/round numbers, byte counts, state bytes, IVs)
+TOKEN_PATTERN = re.compile(r'\b(?=[0-9A-F]*[0-9])[0-9A-F]+\b')
+
+# Longest decimal sent as a JSON number: JavaScript parses numbers as
+# doubles, which hold every integer of up to 15 digits exactly
+MAX_NUMBER_DIGITS = 15
+
+
+def _split(text):
+    """
+    Split text into literal segments and the tokens between them
+
+    Returns:
+        tuple: (segments tuple with len(tokens) + 1 entries, tokens list)
+    """
+    segments = []
+    tokens = []
+    position = 0
+    for match in TOKEN_PATTERN.finditer(text):
+        segments.append(text[position:match.start()])
+        token = match.group()
+        # Short plain decimals travel as JSON numbers; anything that would not
+        # round-trip through int() or a double (leading zeros, hex, long
+        # all-digit hex such as 31323334...) stays a string
+        is_number = token.isdigit() and len(token) <= MAX_NUMBER_DIGITS and str(int(token)) == token
+        tokens.append(int(token) if is_number else token)
+        position = match.end()
+    segments.append(text[position:])
+    return tuple(segments), tokens
+
+
+def _fold_constants(segments, token_lists):
+    """
+    Merge token positions that never vary across token_lists back into the literal text
+
+    Returns:
+        tuple: (refined segments, indexes of the varying token positions)
+    """
+    first = token_lists[0]
+    varying = [i for i in range(len(first)) if any(tokens[i] != first[i] for tokens in token_lists)]
+    varying_set = set(varying)
+    refined = []
+    current = segments[0]
+    for i in range(len(first)):
+        if i in varying_set:
+            refined.append(current)
+            current = segments[i + 1]
+        else:
+            current += str(first[i]) + segments[i + 1]
+    refined.append(current)
+    return tuple(refined), varying
+
+
+def encode_steps(steps):
+    """
+    Encode a list of {"step", "detail"} dicts into the compact format
+
+    Tokens that have the same value everywhere a template is used (e.g.
+    "Step 1" or "AES-256") are folded into the template, so records only
+    carry values that actually change between steps.
+
+    Returns:
+        dict: {"version", "templates": [segment lists], "records": [[name id, detail id, *tokens]]}
+    """
+    split_steps = [(_split(step["step"]), _split(step["detail"])) for step in steps]
+
+    usages = {}
+    for name, detail in split_steps:
+        for segments, tokens in (name, detail):
+            usages.setdefault(segments, []).append(tokens)
+
+    templates = []
+    template_ids = {}
+    refinements = {}
+    for segments, token_lists in usages.items():
+        refined, varying = _fold_constants(segments, token_lists)
+        index = template_ids.get(refined)
+        if index is None:
+            index = template_ids[refined] = len(templates)
+            templates.append(list(refined))
+        refinements[segments] = (index, varying)
+
+    records = []
+    for (name_segments, name_tokens), (detail_segments, detail_tokens) in split_steps:
+        name_id, name_varying = refinements[name_segments]
+        detail_id, detail_varying = refinements[detail_segments]
+        records.append([name_id, detail_id] +
+                       [name_tokens[i] for i in name_varying] +
+                       [detail_tokens[i] for i in detail_varying])
+
+    return {"version": FORMAT_VERSION, "templates": templates, "records": records}
+
+
+def _fill(segments, tokens):
+    parts = [segments[0]]
+    for token, segment in zip(tokens, segments[1:]):
+        parts.append(str(token))
+        parts.append(segment)
+    return "".join(parts)
+
+
+def decode_steps(trace):
+    """
+    Rebuild the step list from encode_steps() output (mirrors expandTrace in static/aes.js)
+    """
+    if trace.get("version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported trace format version: {trace.get('version')}")
+    templates = trace["templates"]
+    steps = []
+    for record in trace["records"]:
+        name_segments = templates[record[0]]
+        detail_segments = templates[record[1]]
+        split = 2 + len(name_segments) - 1
+        steps.append({
+            "step": _fill(name_segments, record[2:split]),
+            "detail": _fill(detail_segments, record[split:]),
+        })
+    return steps
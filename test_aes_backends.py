@@ -0,0 +1,15 @@
+# test_aes_backends.py
+# Every block cipher backend must match the FIPS-197 vector and pycryptodome
+# in each reference mode (the same check benchmark_backends.py runs first).
+import pytest
+
+from aes_backends import BACKENDS, get_backend, verify_backends
+
+
+@pytest.mark.parametrize('name', list(BACKENDS))
+def test_backend_matches_reference(name):
+    try:
+        get_backend(name)
+    except ValueError as e:
+        pytest.skip(str(e))  # Optional dependency (numpy) not installed
+    assert verify_backends([name]) == []
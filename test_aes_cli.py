@@ -0,0 +1,105 @@
+# test_aes_cli.py
+# Round-trips of the framed stream format in every mode, and the AEAD
+# guarantees: swapped, dropped or truncated frames must not decrypt.
+import io
+
+import pytest
+
+from aes_cli import AEAD_MODES, FRAME_LENGTH_SIZE, HEADER_SIZE, MODES, _read_frames, decrypt_stream, encrypt_stream
+
+KEY = b'MySecretKey123456789012345678901'
+CHUNK_SIZE = 16
+# Empty, shorter than a block, exactly one chunk, and several chunks with a short tail
+SIZES = [0, 5, 16, 100]
+
+
+def _encrypt(data, mode, aad=None, trace=None):
+    sink = io.BytesIO()
+    encrypt_stream(io.BytesIO(data), sink, KEY, mode, aad, CHUNK_SIZE, trace)
+    return sink.getvalue()
+
+
+def _decrypt(blob, mode=None, aad=None):
+    sink = io.BytesIO()
+    decrypt_stream(io.BytesIO(blob), sink, KEY, mode, aad)
+    return sink.getvalue()
+
+
+def _split(blob):
+    return blob[:HEADER_SIZE], list(_read_frames(io.BytesIO(blob[HEADER_SIZE:])))
+
+
+def _join(header, frames):
+    return header + b''.join(len(frame).to_bytes(FRAME_LENGTH_SIZE, 'big') + frame for frame in frames)
+
+
+@pytest.mark.parametrize('mode', MODES)
+@pytest.mark.parametrize('size', SIZES)
+def test_round_trip(mode, size):
+    data = bytes(range(256))[:size]
+    assert _decrypt(_encrypt(data, mode)) == data
+
+
+@pytest.mark.parametrize('mode', MODES)
+def test_round_trip_with_trace(mode):
+    data = bytes(range(100))
+    trace = []
+    assert _decrypt(_encrypt(data, mode, trace=trace)) == data
+    assert [chunk["chunk"] for chunk in trace] == list(range(len(trace)))
+
+
+def test_mode_mismatch_rejected():
+    with pytest.raises(ValueError, match="not CBC"):
+        _decrypt(_encrypt(b'x' * 32, 'GCM'), mode='CBC')
+
+
+def test_bad_header_rejected():
+    with pytest.raises(ValueError, match="bad header"):
+        _decrypt(b'not an aes_cli file')
+
+
+@pytest.mark.parametrize('mode', AEAD_MODES)
+def test_aead_aad_round_trip(mode):
+    data = bytes(range(100))
+    blob = _encrypt(data, mode, aad=b'context')
+    assert _decrypt(blob, aad=b'context') == data
+    with pytest.raises(ValueError, match="failed authentication"):
+        _decrypt(blob, aad=b'other')
+
+
+@pytest.mark.parametrize('mode', AEAD_MODES)
+def test_aead_swapped_frames_rejected(mode):
+    header, frames = _split(_encrypt(bytes(64), mode))
+    with pytest.raises(ValueError, match="Frame 0 failed authentication"):
+        _decrypt(_join(header, [frames[1], frames[0]] + frames[2:]))
+
+
+@pytest.mark.parametrize('mode', AEAD_MODES)
+def test_aead_dropped_frame_rejected(mode):
+    header, frames = _split(_encrypt(bytes(64), mode))
+    with pytest.raises(ValueError, match="Frame 1 failed authentication"):
+        _decrypt(_join(header, frames[:1] + frames[2:]))
+
+
+@pytest.mark.parametrize('mode', AEAD_MODES)
+def test_aead_truncated_stream_rejected(mode):
+    header, frames = _split(_encrypt(bytes(64), mode))
+    # Dropping the final frame makes the new last frame claim to be final
+    with pytest.raises(ValueError, match="failed authentication"):
+        _decrypt(_join(header, frames[:-1]))
+    with pytest.raises(ValueError, match="no final frame"):
+        _decrypt(header)
+
+
+@pytest.mark.parametrize('mode', AEAD_MODES)
+def test_aead_empty_input_has_final_frame(mode):
+    header, frames = _split(_encrypt(b'', mode))
+    assert len(frames) == 1
+    assert _decrypt(_join(header, frames)) == b''
+
+
+def test_frame_from_another_file_rejected():
+    header, frames = _split(_encrypt(bytes(64), 'GCM'))
+    other_header, other_frames = _split(_encrypt(bytes(range(64)), 'GCM'))
+    with pytest.raises(ValueError, match="Frame 1 failed authentication"):
+        _decrypt(_join(header, frames[:1] + other_frames[1:2] + frames[2:]))
@@ -0,0 +1,65 @@
+# test_aes_engine.py
+# Authenticated modes of AES256WithSteps: round-trips, tag and AAD checks,
+# empty messages, and AAD rejected where it cannot be authenticated.
+import base64
+
+import pytest
+
+from aes_engine import AES256WithSteps
+
+KEY = b'MySecretKey123456789012345678901'
+AEAD_MODES = ['GCM', 'EAX', 'SIV']
+MESSAGE = 'Authenticated encryption test message'
+
+
+@pytest.mark.parametrize('mode', AEAD_MODES)
+@pytest.mark.parametrize('trace', [True, False])
+def test_round_trip(mode, trace):
+    ciphertext = AES256WithSteps(KEY, mode, aad=b'header', trace=trace).encrypt(MESSAGE)
+    # Nonce + ciphertext + 16-byte tag
+    assert len(base64.b64decode(ciphertext)) == 16 + len(MESSAGE) + 16
+    assert AES256WithSteps(KEY, mode, aad=b'header', trace=trace).decrypt(ciphertext) == MESSAGE
+
+
+@pytest.mark.parametrize('mode', AEAD_MODES)
+def test_wrong_aad_rejected(mode):
+    ciphertext = AES256WithSteps(KEY, mode, aad=b'header').encrypt(MESSAGE)
+    with pytest.raises(ValueError, match="MAC check failed"):
+        AES256WithSteps(KEY, mode, aad=b'other').decrypt(ciphertext)
+    with pytest.raises(ValueError, match="MAC check failed"):
+        AES256WithSteps(KEY, mode).decrypt(ciphertext)
+
+
+@pytest.mark.parametrize('mode', AEAD_MODES)
+def test_flipped_tag_rejected(mode):
+    data = bytearray(base64.b64decode(AES256WithSteps(KEY, mode).encrypt(MESSAGE)))
+    data[-1] ^= 0x01
+    with pytest.raises(ValueError, match="MAC check failed"):
+        AES256WithSteps(KEY, mode).decrypt(base64.b64encode(bytes(data)).decode('ascii'))
+
+
+@pytest.mark.parametrize('mode', AEAD_MODES)
+def test_flipped_ciphertext_rejected(mode):
+    data = bytearray(base64.b64decode(AES256WithSteps(KEY, mode).encrypt(MESSAGE)))
+    data[16] ^= 0x01
+    with pytest.raises(ValueError, match="MAC check failed"):
+        AES256WithSteps(KEY, mode).decrypt(base64.b64encode(bytes(data)).decode('ascii'))
+
+
+@pytest.mark.parametrize('mode', AEAD_MODES)
+def test_empty_message_untraced(mode):
+    ciphertext = AES256WithSteps(KEY, mode, aad=b'header', trace=False).encrypt(b'', raw=True)
+    assert len(ciphertext) == 32
+    assert AES256WithSteps(KEY, mode, aad=b'header', trace=False).decrypt(ciphertext, raw=True) == b''
+
+
+@pytest.mark.parametrize('mode', AEAD_MODES)
+def test_short_ciphertext_rejected(mode):
+    with pytest.raises(ValueError, match="minimum 32 required"):
+        AES256WithSteps(KEY, mode).decrypt(bytes(31), raw=True)
+
+
+@pytest.mark.parametrize('mode', ['ECB', 'CBC', 'CFB', 'OFB', 'CTR'])
+def test_aad_rejected_outside_aead_modes(mode):
+    with pytest.raises(ValueError, match="only supported in GCM, EAX and SIV"):
+        AES256WithSteps(KEY, mode, aad=b'header')
@@ -0,0 +1,53 @@
+# test_app.py
+# /process input limits for the reference backends: ciphertext produced from
+# input at a backend's limit must decrypt with that same backend.
+import pytest
+
+import app as app_module
+import xmind_exporter
+from aes_backends import get_backend
+
+KEY = 'MySecretKey123456789012345678901'
+IV = '1234567890123456'
+
+
+@pytest.fixture
+def client(monkeypatch):
+    # The XMind export is not under test and is slow for long traces
+    monkeypatch.setattr(xmind_exporter, 'export_to_xmind', lambda steps, output_path: None)
+    return app_module.app.test_client()
+
+
+def _process(client, **fields):
+    return client.post('/process', data=dict({'key': KEY, 'iv': IV}, **fields)).get_json()
+
+
+def _limit(backend, mode):
+    return app_module.BACKEND_MODE_INPUT_LIMITS.get((backend, mode), app_module.BACKEND_INPUT_LIMITS[backend])
+
+
+@pytest.mark.parametrize('backend, mode, key_type', [
+    ('ttable', 'CTR', 'raw'),
+    ('ttable', 'CBC', 'pbkdf2'),
+    ('bitslice', 'CBC', 'raw'),
+    ('bitslice', 'ECB', 'raw'),
+    ('bitslice', 'CFB', 'raw'),
+])
+def test_round_trip_at_limit(client, backend, mode, key_type):
+    try:
+        get_backend(backend)
+    except ValueError as e:
+        pytest.skip(str(e))  # Optional dependency (numpy) not installed
+    text = 'x' * _limit(backend, mode)
+    fields = {'mode': mode, 'backend': backend, 'key_type': key_type}
+    encrypted = _process(client, action='encrypt', text=text, **fields)
+    assert 'error' not in encrypted
+    decrypted = _process(client, action='decrypt', text=encrypted['result'], **fields)
+    assert decrypted.get('error') is None
+    assert decrypted['result'] == text
+
+
+def test_over_limit_rejected(client):
+    text = 'x' * (_limit('ttable', 'CTR') + 1)
+    result = _process(client, action='encrypt', text=text, mode='CTR', backend='ttable')
+    assert 'at most' in result['error']
@@ -0,0 +1,80 @@
+# test_key_derivation.py
+# Passphrase round-trips, the derived-key cache, and the ceilings on KDF
+# parameters read from untrusted ciphertext headers.
+import base64
+
+import pytest
+
+import key_derivation
+from key_derivation import DerivedKeyCache, PassphraseAES256, decode_header, derive_key, encode_header
+
+# Cheap parameters keep the tests fast; the defaults are exercised by the app
+FAST_PARAMS = {'PBKDF2': {'iterations': 1000}, 'SCRYPT': {'n': 2 ** 10, 'r': 8, 'p': 1}}
+MESSAGE = 'Passphrase protected message'
+
+
+@pytest.mark.parametrize('kdf', ['PBKDF2', 'SCRYPT'])
+@pytest.mark.parametrize('mode', ['CBC', 'GCM'])
+def test_round_trip(kdf, mode):
+    ciphertext = PassphraseAES256('correct horse', mode, kdf=kdf, params=FAST_PARAMS[kdf], cache=None).encrypt(MESSAGE)
+    assert PassphraseAES256('correct horse', mode, cache=None).decrypt(ciphertext) == MESSAGE
+    with pytest.raises(ValueError):
+        PassphraseAES256('wrong horse', mode, cache=None).decrypt(ciphertext)
+
+
+def test_every_encryption_gets_a_fresh_salt():
+    aes = PassphraseAES256('correct horse', 'GCM', params=FAST_PARAMS['PBKDF2'], cache=DerivedKeyCache())
+    salts = {decode_header(base64.b64decode(aes.encrypt(MESSAGE)))[2] for _ in range(3)}
+    assert len(salts) == 3
+
+
+def test_cache_hit_skips_derivation():
+    cache = DerivedKeyCache()
+    ciphertext = PassphraseAES256('correct horse', 'GCM', params=FAST_PARAMS['PBKDF2'], cache=cache).encrypt(MESSAGE)
+    assert (cache.hits, cache.misses) == (0, 1)
+    decryptor = PassphraseAES256('correct horse', 'GCM', cache=cache)
+    assert decryptor.decrypt(ciphertext) == MESSAGE
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert "Cache: hit" in decryptor.get_steps()[0]["detail"]
+    # A different passphrase or salt is a miss
+    salt = decode_header(base64.b64decode(ciphertext))[2]
+    derive_key(b'other', salt, 'PBKDF2', FAST_PARAMS['PBKDF2'], cache)
+    derive_key(b'correct horse', bytes(16), 'PBKDF2', FAST_PARAMS['PBKDF2'], cache)
+    assert (cache.hits, cache.misses) == (1, 3)
+
+
+def test_cache_is_bounded():
+    cache = DerivedKeyCache(max_entries=2)
+    for salt in [b'a' * 16, b'b' * 16, b'c' * 16]:
+        derive_key(b'pass', salt, 'PBKDF2', FAST_PARAMS['PBKDF2'], cache)
+    assert cache.get(b'pass', 'PBKDF2', {'iterations': 1000}, b'a' * 16) is None
+    assert cache.get(b'pass', 'PBKDF2', {'iterations': 1000}, b'c' * 16) is not None
+
+
+def _crafted(kdf, params):
+    # encode_header does not validate, so it can build headers an attacker would
+    return base64.b64encode(encode_header(kdf, params, bytes(16)) + bytes(48)).decode('ascii')
+
+
+@pytest.mark.parametrize('kdf, params', [
+    ('PBKDF2', {'iterations': 10000000}),
+    ('PBKDF2', {'iterations': 999}),
+    ('SCRYPT', {'n': 2 ** 20, 'r': 255, 'p': 255}),
+    ('SCRYPT', {'n': 2 ** 15, 'r': 8, 'p': 5}),
+    ('SCRYPT', {'n': 2 ** 17, 'r': 8, 'p': 1}),
+    ('SCRYPT', {'n': 2 ** 10, 'r': 0, 'p': 1}),
+])
+def test_crafted_header_rejected_before_derivation(monkeypatch, kdf, params):
+    def fail(*args, **kwargs):
+        raise AssertionError("key derived from a rejected header")
+
+    monkeypatch.setattr(key_derivation, 'derive_key', fail)
+    with pytest.raises(ValueError, match="must"):
+        PassphraseAES256('correct horse', 'GCM', cache=None).decrypt(_crafted(kdf, params))
+
+
+def test_limits_allow_the_ceiling():
+    params = {'n': 2 ** 16, 'r': 8, 'p': key_derivation.MAX_SCRYPT_PARALLELISM}
+    assert decode_header(encode_header('SCRYPT', params, bytes(16)))[1] == params
+    params = {'iterations': key_derivation.MAX_PBKDF2_ITERATIONS}
+    assert decode_header(encode_header('PBKDF2', params, bytes(16)))[1] == params
@@ -0,0 +1,17 @@
+# test_startup.py
+# Entry points must not load heavy modules at import time (see
+# benchmark_startup.py, which CI also runs with a time budget).
+import pytest
+
+from benchmark_startup import DEFERRED_IMPORTS, _missing_optional_dependency, measure_import
+
+
+@pytest.mark.parametrize('module', list(DEFERRED_IMPORTS))
+def test_deferred_imports(module):
+    try:
+        _, loaded = measure_import(module)
+    except RuntimeError as e:
+        if _missing_optional_dependency(e):
+            pytest.skip(str(e).strip().splitlines()[-1])
+        raise
+    assert sorted(name for name in DEFERRED_IMPORTS[module] if name in loaded) == []
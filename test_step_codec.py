@@ -0,0 +1,47 @@
+# test_step_codec.py
+# Round-trips real engine traces through the compact format, including a
+# JSON hop that parses numbers as doubles the way the browser does.
+import json
+
+from aes_engine import AES256WithSteps
+from step_codec import decode_steps, encode_steps
+
+KEY = b'MySecretKey123456789012345678901'
+# All-digit text and IV produce hex state made only of decimal digits; the
+# blocks differ so those tokens vary between steps instead of being folded
+DIGITS = b'1234567890123456'
+PLAINTEXT = DIGITS + b'6543210987654321' + b'1111111111111111'
+
+
+def _browser_round_trip(trace):
+    """Serialize, then parse every number as a JavaScript double would"""
+    return json.loads(json.dumps(trace), parse_int=lambda text: int(float(text)))
+
+
+def _traces():
+    for mode in ['ECB', 'CBC', 'CTR', 'GCM']:
+        iv = None if mode == 'ECB' else DIGITS
+        aes = AES256WithSteps(KEY, mode, iv)
+        encrypted = aes.encrypt(PLAINTEXT)
+        yield mode, 'encrypt', aes.get_steps()
+        aes = AES256WithSteps(KEY, mode)
+        aes.decrypt(encrypted)
+        yield mode, 'decrypt', aes.get_steps()
+
+
+def test_round_trip():
+    for mode, action, steps in _traces():
+        assert decode_steps(encode_steps(steps)) == steps, (mode, action)
+
+
+def test_round_trip_through_double_precision_json():
+    for mode, action, steps in _traces():
+        assert decode_steps(_browser_round_trip(encode_steps(steps))) == steps, (mode, action)
+
+
+def test_long_digit_runs_stay_strings():
+    steps = [{"step": "State", "detail": "Bytes: 31323334353637383930313233343536"},
+             {"step": "State", "detail": "Bytes: 36353433323130393837363534333231"}]
+    encoded = encode_steps(steps)
+    assert all(isinstance(value, str) for record in encoded["records"] for value in record[2:])
+    assert decode_steps(_browser_round_trip(encoded)) == steps